@@ -0,0 +1,13 @@
+import shutil
+import tempfile
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def temp_media_root(settings):
+    """Файлы, которые создают фикстуры постов, пишем во временную папку."""
+    media_root = tempfile.mkdtemp()
+    settings.MEDIA_ROOT = media_root
+    yield
+    shutil.rmtree(media_root, ignore_errors=True)
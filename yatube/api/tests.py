@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+from .urls import QUERY_BUDGETS
+
+User = get_user_model()
+
+
+class PostsApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='api',
+            description='Тестовое описание',
+        )
+        for i in range(settings.API_PAGE_SIZE + 5):
+            Post.objects.create(
+                author=cls.user, text=f'Пост {i}', group=cls.group)
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.urls = {
+            'posts': reverse('api:posts'),
+            'group_posts': reverse(
+                'api:group_posts', kwargs={'slug': self.group.slug}),
+            'profile_posts': reverse(
+                'api:profile_posts',
+                kwargs={'username': self.user.username}),
+        }
+
+    def test_lists_and_cursor_pages(self):
+        """Ленты отдают JSON и листаются ссылками next/previous."""
+        expected = list(Post.objects.order_by(
+            '-pub_date', '-pk').values_list('text', flat=True))
+        for name, url in self.urls.items():
+            with self.subTest(url=url):
+                first = self.guest_client.get(url).json()
+                self.assertEqual(
+                    [post['text'] for post in first['results']],
+                    expected[:settings.API_PAGE_SIZE])
+                self.assertEqual(first['results'][0]['author'], 'HasNoName')
+                self.assertEqual(first['results'][0]['group'], 'api')
+                self.assertIsNone(first['previous'])
+                second = self.guest_client.get(first['next']).json()
+                self.assertEqual(
+                    [post['text'] for post in second['results']],
+                    expected[settings.API_PAGE_SIZE:])
+                self.assertIsNone(second['next'])
+                back = self.guest_client.get(second['previous']).json()
+                self.assertEqual(back['results'], first['results'])
+
+    def test_sparse_fields(self):
+        """fields= ограничивает набор полей, неизвестные поля — 400."""
+        response = self.guest_client.get(
+            self.urls['posts'], {'fields': 'id,text'})
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'text'})
+        self.assertIn('fields=id%2Ctext', response.json()['next'])
+        response = self.guest_client.get(
+            self.urls['posts'], {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_group_and_author(self):
+        """Несуществующие группа и автор дают 404."""
+        for name in ('api:group_posts', 'api:profile_posts'):
+            kwarg = 'slug' if name == 'api:group_posts' else 'username'
+            with self.subTest(url=name):
+                response = self.guest_client.get(
+                    reverse(name, kwargs={kwarg: 'missing'}))
+                self.assertEqual(response.status_code, 404)
+
+    def test_query_budget(self):
+        """Одна выборка на ленту, без объектов моделей."""
+        for name, url in self.urls.items():
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    self.guest_client.get(url)
+                self.assertLessEqual(len(queries), QUERY_BUDGETS[name])
@@ -0,0 +1,19 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.posts_list, name='posts'),
+    path('groups/<slug:slug>/posts/', views.group_posts, name='group_posts'),
+    path('profile/<str:username>/posts/', views.profile_posts,
+         name='profile_posts'),
+]
+
+# Бюджет SQL-запросов (см. core.middleware.query_budget).
+QUERY_BUDGETS = {
+    'posts': 1,
+    'group_posts': 2,
+    'profile_posts': 2,
+}
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import urlencode
+
+from posts.models import Group, Post, User
+from posts.paginator import CursorPaginator
+
+# Ответы собираются из словарей .values() без создания объектов Post.
+# Цель по задержке — settings.API_LATENCY_TARGET_MS на запрос (p95),
+# её проверяет команда benchmark (core.benchmark.check_latency_targets).
+
+# Публичное имя поля -> поле ORM.
+FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+# Нужны пагинатору, даже если клиент их не просил.
+CURSOR_FIELDS = ('id', 'pub_date')
+
+
+def requested_fields(request):
+    """Разбираем ?fields=id,text; None — если есть неизвестные поля."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(FIELDS)
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    if not names or any(name not in FIELDS for name in names):
+        return None
+    return names
+
+
+def page_url(request, **params):
+    query = {
+        name: value for name, value in request.GET.items()
+        if name not in ('after', 'before')
+    }
+    query.update(params)
+    return f'{request.path}?{urlencode(query)}'
+
+
+def posts_response(request, posts):
+    names = requested_fields(request)
+    if names is None:
+        return JsonResponse(
+            {'error': 'Неизвестное поле в fields.',
+             'fields': sorted(FIELDS)},
+            status=400,
+        )
+    columns = {FIELDS[name] for name in names} | set(CURSOR_FIELDS)
+    paginator = CursorPaginator(
+        posts.values(*columns), settings.API_PAGE_SIZE)
+    page = paginator.get_page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    results = [
+        {name: row[FIELDS[name]] for name in names} for row in page
+    ]
+    return JsonResponse({
+        'results': results,
+        'next': page_url(request, after=page.next_cursor)
+        if page.has_next() else None,
+        'previous': page_url(request, before=page.previous_cursor)
+        if page.has_previous() else None,
+    }, json_dumps_params={'ensure_ascii': False})
+
+
+def posts_list(request):
+    return posts_response(request, Post.objects.all())
+
+
+def group_posts(request, slug):
+    group = get_object_or_404(Group.objects.only('pk'), slug=slug)
+    return posts_response(request, Post.objects.filter(group=group))
+
+
+def profile_posts(request, username):
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    return posts_response(request, Post.objects.filter(author=author))
@@ -0,0 +1,96 @@
+import math
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .metrics import Gauge, registry
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def take_token(user_id, now=None):
+    """Token bucket пользователя в кэше.
+
+    Возвращает 0, если токен взят, иначе сколько секунд ждать
+    следующего. Гонка двух запросов одного пользователя может
+    пропустить лишнюю запись: для защиты базы это не страшно.
+    """
+    now = time.time() if now is None else now
+    capacity = settings.WRITE_BUCKET_CAPACITY
+    refill = settings.WRITE_BUCKET_REFILL_PER_SECOND
+    key = f'write-bucket:{user_id}'
+    tokens, updated_at = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated_at) * refill)
+    if tokens < 1:
+        cache.set(key, (tokens, now), math.ceil(capacity / refill))
+        return (1 - tokens) / refill
+    cache.set(key, (tokens - 1, now), math.ceil(capacity / refill))
+    return 0
+
+
+class InFlightLimiter:
+    """Сколько записей процесс выполняет одновременно.
+
+    SQLite всё равно пишет по одной: лишние запросы лучше отклонить
+    сразу, чем держать в очереди на блокировке базы.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def try_acquire(self):
+        with self.lock:
+            if self.count >= settings.WRITE_MAX_IN_FLIGHT:
+                return False
+            self.count += 1
+        return True
+
+    def release(self):
+        with self.lock:
+            self.count -= 1
+
+
+in_flight = InFlightLimiter()
+registry.register_gauge(Gauge(
+    'yatube_writes_in_flight', 'Записи, выполняющиеся прямо сейчас.',
+    lambda: in_flight.count))
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        'Слишком много запросов на запись, повторите позже.',
+        content_type='text/plain; charset=utf-8',
+        status=429,
+    )
+    response['Retry-After'] = max(1, math.ceil(retry_after))
+    return response
+
+
+def admit_writes(view):
+    """Пропускаем запись, только если позволяют бюджет и нагрузка.
+
+    GET и другие безопасные запросы не ограничиваются.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(request, *args, **kwargs)
+        view_name = request.resolver_match.view_name
+        # Сначала слот: отказ «занято» не должен тратить токен.
+        if not in_flight.try_acquire():
+            registry.reject_write(view_name, 'busy')
+            return too_many_requests(settings.WRITE_BUSY_RETRY_AFTER)
+        try:
+            wait = take_token(request.user.pk)
+            if wait:
+                registry.reject_write(view_name, 'throttled')
+                return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+        finally:
+            in_flight.release()
+    return wrapper
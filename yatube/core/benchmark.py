@@ -0,0 +1,198 @@
+import json
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+
+from posts.models import Group, Post
+from posts.stats import rebuild_author_stats, rebuild_counters
+
+User = get_user_model()
+
+BENCHMARK_NAMESPACES = ('posts', 'users', 'about', 'api')
+BENCHMARK_PREFIX = 'bench'
+
+# Значения для именованных параметров маршрутов.
+ROUTE_KWARGS = {
+    'slug': lambda sample: sample.group.slug,
+    'username': lambda sample: sample.author.username,
+    'post_id': lambda sample: sample.pk,
+}
+# Маршруты, которым нужен GET-запрос с параметрами.
+ROUTE_QUERY = {
+    'posts:search': {'q': 'пост'},
+    'posts:group_autocomplete': {'q': 'Груп'},
+}
+# Страницы, которые открываем от имени автора (staff).
+AUTHORIZED_ROUTES = {
+    'posts:post_create',
+    'posts:post_edit',
+    'posts:export_posts',
+    'posts:follow_index',
+}
+# Маршруты только для POST: GET-замер для них бессмыслен.
+SKIPPED_ROUTES = {
+    'posts:profile_follow',
+    'posts:profile_unfollow',
+}
+
+
+def seed_dataset(users=10, groups=5, posts=200):
+    """Наполняем базу тестовыми данными и возвращаем образцовый пост."""
+    authors = User.objects.bulk_create(
+        User(username=f'{BENCHMARK_PREFIX}{i}', is_staff=True)
+        for i in range(users)
+    )
+    # bulk_create в SQLite не возвращает pk, перечитываем объекты.
+    authors = list(User.objects.filter(
+        username__startswith=BENCHMARK_PREFIX).order_by('pk'))
+    Group.objects.bulk_create(
+        Group(title=f'Группа {i}', slug=f'{BENCHMARK_PREFIX}-{i}',
+              description='Группа для замеров')
+        for i in range(groups)
+    )
+    all_groups = list(Group.objects.filter(
+        slug__startswith=f'{BENCHMARK_PREFIX}-').order_by('pk'))
+    Post.objects.bulk_create(
+        Post(text=f'Тестовый пост {i}',
+             author=authors[i % len(authors)],
+             group=all_groups[i % len(all_groups)] if all_groups else None)
+        for i in range(posts)
+    )
+    # bulk_create обходит сигналы: счётчики пересобираем сами.
+    rebuild_author_stats()
+    rebuild_counters()
+    cache.clear()
+    return Post.objects.select_related('author', 'group').filter(
+        group__isnull=False).latest('pub_date', 'pk')
+
+
+def benchmark_routes(namespaces=BENCHMARK_NAMESPACES):
+    """Имена всех именованных маршрутов из пространств имён."""
+    resolver = get_resolver()
+    names = []
+    for namespace in namespaces:
+        prefix, sub_resolver = resolver.namespace_dict[namespace]
+        url_names = (
+            name for name in sub_resolver.reverse_dict
+            if isinstance(name, str))
+        names.extend(
+            f'{namespace}:{name}' for name in sorted(url_names)
+            if f'{namespace}:{name}' not in SKIPPED_ROUTES)
+    return names
+
+
+def route_url(name, sample):
+    """Собираем URL маршрута по данным образцового поста."""
+    resolver = get_resolver()
+    namespace, url_name = name.split(':')
+    sub_resolver = resolver.namespace_dict[namespace][1]
+    params = sub_resolver.reverse_dict.getlist(url_name)[0][0][0][1]
+    kwargs = {param: ROUTE_KWARGS[param](sample) for param in params}
+    return reverse(name, kwargs=kwargs)
+
+
+def percentile(timings, share):
+    ordered = sorted(timings)
+    index = max(0, int(round(len(ordered) * share)) - 1)
+    return ordered[index]
+
+
+def measure(client, url, data, repeat):
+    """Время, запросы и размер ответа для одной страницы.
+
+    Кэш сбрасывается перед первым запросом: в числе запросов
+    учитывается холодный прогон, в задержках — все.
+    """
+    cache.clear()
+    timings = []
+    queries = 0
+    size = 0
+    status = None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url, data)
+            body = b''.join(response) if response.streaming else (
+                response.content)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(captured))
+        size = len(body)
+        status = response.status_code
+    return {
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'queries': queries,
+        'bytes': size,
+        'status': status,
+    }
+
+
+def run_benchmark(sample, repeat=20, routes=None):
+    """Прогоняем каждый маршрут тестовым клиентом и собираем метрики."""
+    guest = Client()
+    author = Client()
+    author.force_login(sample.author)
+    results = {}
+    for name in routes or benchmark_routes():
+        client = author if name in AUTHORIZED_ROUTES else guest
+        results[name] = measure(
+            client, route_url(name, sample), ROUTE_QUERY.get(name), repeat)
+    return results
+
+
+def compare_results(results, baseline, threshold=0.2):
+    """Список регрессий относительно сохранённого baseline.
+
+    Регрессия — p95 выше baseline больше чем на threshold
+    или больше SQL-запросов, чем было.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        saved = baseline.get(name)
+        if saved is None:
+            continue
+        limit = saved['p95_ms'] * (1 + threshold)
+        if current['p95_ms'] > limit:
+            regressions.append(
+                f'{name}: p95 {current["p95_ms"]} мс '
+                f'против {saved["p95_ms"]} мс')
+        if current['queries'] > saved['queries']:
+            regressions.append(
+                f'{name}: {current["queries"]} SQL-запросов '
+                f'против {saved["queries"]}')
+    return regressions
+
+
+def latency_targets():
+    """Опубликованные цели по p95 (мс) для пространств имён."""
+    return {'api': settings.API_LATENCY_TARGET_MS}
+
+
+def check_latency_targets(results, targets=None):
+    """Список маршрутов, p95 которых выше цели своего пространства."""
+    if targets is None:
+        targets = latency_targets()
+    violations = []
+    for name, result in sorted(results.items()):
+        target = targets.get(name.split(':')[0])
+        if target is not None and result['p95_ms'] > target:
+            violations.append(
+                f'{name}: p95 {result["p95_ms"]} мс при цели {target} мс')
+    return violations
+
+
+def load_results(path):
+    with open(path) as source:
+        return json.load(source)
+
+
+def save_results(results, path):
+    with open(path, 'w') as target:
+        json.dump(results, target, ensure_ascii=False, indent=2,
+                  sort_keys=True)
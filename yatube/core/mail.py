@@ -0,0 +1,128 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+def join_addresses(addresses):
+    return '\n'.join(addresses or ())
+
+
+def split_addresses(value):
+    return value.splitlines()
+
+
+def html_alternative(message):
+    for content, mimetype in getattr(message, 'alternatives', ()):
+        if mimetype == 'text/html':
+            return content
+    return ''
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Кладёт письма в таблицу OutboxMessage вместо отправки.
+
+    Вложения не поддерживаются: письмам auth они не нужны.
+    """
+
+    def send_messages(self, email_messages):
+        rows = [
+            OutboxMessage(
+                subject=message.subject,
+                body=message.body,
+                html=html_alternative(message),
+                from_email=message.from_email,
+                to=join_addresses(message.to),
+                cc=join_addresses(message.cc),
+                bcc=join_addresses(message.bcc),
+                reply_to=join_addresses(message.reply_to),
+            )
+            for message in email_messages if message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(rows)
+        return len(rows)
+
+
+def build_message(row, connection):
+    message = EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email,
+        to=split_addresses(row.to),
+        cc=split_addresses(row.cc),
+        bcc=split_addresses(row.bcc),
+        reply_to=split_addresses(row.reply_to),
+        connection=connection,
+    )
+    if row.html:
+        message.attach_alternative(row.html, 'text/html')
+    return message
+
+
+def claim_batch(batch_size):
+    """Забираем пачку писем, продлевая им срок на время отправки.
+
+    Второй воркер не возьмёт письма, которые уже отправляются.
+    """
+    now = timezone.now()
+    due = list(OutboxMessage.objects.filter(
+        sent_at__isnull=True,
+        next_attempt_at__lte=now,
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+    ).values_list('pk', 'next_attempt_at')[:batch_size])
+    lease = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    claimed = [
+        pk for pk, next_attempt_at in due
+        if OutboxMessage.objects.filter(
+            pk=pk, next_attempt_at=next_attempt_at).update(
+            next_attempt_at=lease)
+    ]
+    return list(OutboxMessage.objects.filter(pk__in=claimed))
+
+
+def retry_delay(attempts):
+    """Экспоненциальная пауза перед следующей попыткой."""
+    return timedelta(
+        seconds=settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def drain_outbox(batch_size=None, rate=None, sleep=time.sleep):
+    """Отправляем одну пачку писем не быстрее rate писем в секунду.
+
+    Возвращает (отправлено, ошибок).
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    rate = rate or settings.OUTBOX_RATE_PER_SECOND
+    rows = claim_batch(batch_size)
+    if not rows:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+    with connection:
+        for row in rows:
+            started = time.monotonic()
+            try:
+                build_message(row, connection).send()
+            except Exception as error:
+                failed += 1
+                attempts = row.attempts + 1
+                OutboxMessage.objects.filter(pk=row.pk).update(
+                    attempts=F('attempts') + 1,
+                    last_error=str(error),
+                    next_attempt_at=timezone.now() + retry_delay(attempts),
+                )
+            else:
+                sent += 1
+                OutboxMessage.objects.filter(pk=row.pk).update(
+                    sent_at=timezone.now(), attempts=F('attempts') + 1)
+            # Держим темп: всплеск сбросов пароля не забьёт почтовый сервер.
+            pause = 1 / rate - (time.monotonic() - started)
+            if pause > 0:
+                sleep(pause)
+    return sent, failed
@@ -0,0 +1,81 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from core.benchmark import (check_latency_targets, compare_results,
+                            load_results, run_benchmark, save_results,
+                            seed_dataset)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет p50/p95, число SQL-запросов и размер ответа каждой '
+        'страницы posts, users, about и api на тестовой базе, проверяет '
+        'цели по задержке и сравнивает результат с сохранённым baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--groups', type=int, default=5)
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Запросов на каждую страницу.')
+        parser.add_argument(
+            '--output', default='benchmark.json',
+            help='Куда записать результаты в JSON.')
+        parser.add_argument(
+            '--baseline',
+            help='JSON с прошлыми результатами для сравнения.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Допустимый рост p95 относительно baseline (0.2 = 20%%).')
+
+    def handle(self, *args, **options):
+        if min(options['repeat'], options['users'], options['groups'],
+               options['posts']) < 1:
+            # Страницам групп и профилей нужен хотя бы один пост в группе.
+            raise CommandError(
+                '--repeat, --users, --groups и --posts должны быть '
+                'положительными.')
+        baseline = None
+        if options['baseline']:
+            if not os.path.exists(options['baseline']):
+                raise CommandError(f'Нет файла {options["baseline"]}.')
+            baseline = load_results(options['baseline'])
+        results = self.measure(options)
+        save_results(results, options['output'])
+        for name, result in sorted(results.items()):
+            self.stdout.write(
+                f'{name}: p50 {result["p50_ms"]} мс, '
+                f'p95 {result["p95_ms"]} мс, {result["queries"]} SQL, '
+                f'{result["bytes"]} байт'
+            )
+        violations = check_latency_targets(results)
+        if violations:
+            raise CommandError(
+                'Цели по задержке не выполнены:\n' + '\n'.join(violations))
+        if baseline is None:
+            return
+        regressions = compare_results(
+            results, baseline, options['threshold'])
+        if regressions:
+            raise CommandError(
+                'Регрессии производительности:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
+
+    def measure(self, options):
+        # Замеры идут на отдельной тестовой базе, рабочую не трогаем.
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            sample = seed_dataset(
+                options['users'], options['groups'], options['posts'])
+            return run_benchmark(sample, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.mail import drain_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutboxMessage пачками, с заданным '
+        'темпом и повторными попытками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            '--rate', type=float, default=settings.OUTBOX_RATE_PER_SECOND,
+            help='Не больше стольких писем в секунду.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не выходить, а ждать новые письма.')
+        parser.add_argument(
+            '--idle', type=float, default=5,
+            help='Пауза в секундах, когда очередь пуста (для --loop).')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['rate'] <= 0:
+            raise CommandError(
+                '--batch-size и --rate должны быть положительными.')
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = drain_outbox(
+                options['batch_size'], options['rate'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['idle'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {total_sent}, ошибок: {total_failed}.'))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db import optimize_database
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновляет статистику планировщика SQLite (PRAGMA optimize, '
+        'по флагу — полный ANALYZE) и сбрасывает WAL. Запускается из cron '
+        'или сам по себе с --every.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Полный ANALYZE вместо выборочного PRAGMA optimize.')
+        parser.add_argument(
+            '--every', type=int,
+            help='Повторять раз в столько секунд, пока не прервут.')
+
+    def handle(self, *args, **options):
+        every = options['every']
+        if every is not None and every < 1:
+            raise CommandError('--every должен быть положительным.')
+        while True:
+            self.run_once(options)
+            if every is None:
+                return
+            time.sleep(every)
+
+    def run_once(self, options):
+        checkpoint = optimize_database(
+            options['database'], analyze=options['analyze'])
+        self.stdout.write(self.style.SUCCESS(
+            f'База {options["database"]} оптимизирована, '
+            f'WAL checkpoint: {checkpoint}.'))
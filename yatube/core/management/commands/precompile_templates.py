@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.template_backend import precompile_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Разбирает все шаблоны из TEMPLATES DIRS и каталогов приложений '
+        'и сообщает о синтаксических ошибках.'
+    )
+
+    def handle(self, *args, **options):
+        compiled, errors = precompile_templates()
+        if errors:
+            raise CommandError('Ошибки в шаблонах:\n' + '\n'.join(
+                f'{name}: {error}' for name, error in errors))
+        self.stdout.write(self.style.SUCCESS(
+            f'Разобрано шаблонов: {compiled}.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплику через backup API. '
+        'Нужна, чтобы проверить чтение с реплики локально на двух файлах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', default='replica')
+
+    def handle(self, *args, **options):
+        alias = options['replica']
+        if alias not in connections:
+            raise CommandError(f'Нет базы {alias} в DATABASES.')
+        source, target = connections['default'], connections[alias]
+        if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+            raise CommandError('Команда работает только с SQLite.')
+        source.ensure_connection()
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+        self.stdout.write(self.style.SUCCESS(f'Реплика {alias} обновлена.'))
@@ -0,0 +1,171 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Верхние границы корзин гистограмм в секундах.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Время отрисовки шаблонов текущего запроса (см. TimedDjangoTemplates).
+_render = threading.local()
+
+
+def reset_render_time():
+    _render.seconds = 0.0
+    _render.depth = 0
+
+
+def render_time():
+    return getattr(_render, 'seconds', 0.0)
+
+
+@contextmanager
+def timed_render():
+    """Считаем только внешний render: вложенные шаблоны уже внутри него."""
+    depth = getattr(_render, 'depth', 0)
+    _render.depth = depth + 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _render.depth = depth
+        if depth == 0:
+            _render.seconds = render_time() + (
+                time.perf_counter() - started)
+
+
+class Histogram:
+    """Гистограмма Prometheus с меткой view, хранится в памяти процесса."""
+
+    def __init__(self, name, documentation, buckets=BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, view, value):
+        series = self.series.get(view)
+        if series is None:
+            series = self.series[view] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def exposition(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram',
+        ]
+        for view, (counts, total, count) in sorted(self.series.items()):
+            label = f'view="{view}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{self.name}_bucket{{{label},le="{bound}"}} '
+                    f'{cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{label}}} {total:.6f}')
+            lines.append(f'{self.name}_count{{{label}}} {count}')
+        return lines
+
+
+class Counter:
+    """Счётчик Prometheus с произвольными метками."""
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.series = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        self.series[key] = self.series.get(key, 0) + amount
+
+    def exposition(self):
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} counter',
+        ]
+        for key, value in sorted(self.series.items()):
+            labels = ','.join(f'{name}="{label}"' for name, label in key)
+            series = f'{self.name}{{{labels}}}' if labels else self.name
+            lines.append(f'{series} {value}')
+        return lines
+
+
+class Gauge:
+    """Gauge Prometheus, значение которого читается при выдаче /metrics.
+
+    Своего состояния нет: read() возвращает текущее значение, поэтому
+    gauge не расходится с тем, что он показывает.
+    """
+
+    def __init__(self, name, documentation, read):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def exposition(self):
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} gauge',
+            f'{self.name} {self.read()}',
+        ]
+
+
+class Registry:
+    """Метрики запросов по имени view."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_seconds = Histogram(
+            'yatube_request_duration_seconds', 'Время обработки запроса.')
+        self.db_seconds = Histogram(
+            'yatube_db_duration_seconds', 'Время SQL-запросов за запрос.')
+        self.db_queries = Histogram(
+            'yatube_db_queries', 'Число SQL-запросов за запрос.',
+            buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100))
+        self.template_seconds = Histogram(
+            'yatube_template_duration_seconds',
+            'Время отрисовки шаблонов за запрос.')
+        self.write_rejections = Counter(
+            'yatube_write_rejections_total',
+            'Записи, отклонённые с 429, по view и причине.')
+        self.gauges = []
+
+    def observe(self, view, total, db_time, db_count, template_time):
+        with self.lock:
+            self.request_seconds.observe(view, total)
+            self.db_seconds.observe(view, db_time)
+            self.db_queries.observe(view, db_count)
+            self.template_seconds.observe(view, template_time)
+
+    def reject_write(self, view, reason):
+        with self.lock:
+            self.write_rejections.inc(view=view, reason=reason)
+
+    def register_gauge(self, gauge):
+        with self.lock:
+            self.gauges.append(gauge)
+
+    def exposition(self):
+        with self.lock:
+            lines = []
+            for metric in (self.request_seconds, self.db_seconds,
+                           self.db_queries, self.template_seconds,
+                           self.write_rejections, *self.gauges):
+                lines.extend(metric.exposition())
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        # Gauge читают живое состояние, сбрасывать в них нечего.
+        with self.lock:
+            gauges = self.gauges
+            self.__init__()
+            self.gauges = gauges
+
+
+registry = Registry()
@@ -0,0 +1,43 @@
+import time
+
+from ..db import execute_wrapper_all
+from ..metrics import registry, render_time, reset_render_time
+
+
+class RequestMetricsMiddleware:
+    """Собирает время запроса, SQL и шаблонов по имени view.
+
+    Отдаёт их в заголовке Server-Timing и копит гистограммы для /metrics.
+    На каждый запрос — несколько вызовов perf_counter и по обёртке
+    курсора на каждую базу, чтобы запросы к репликам тоже считались.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        db = [0, 0.0]
+
+        def time_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db[0] += 1
+                db[1] += time.perf_counter() - started
+
+        reset_render_time()
+        started = time.perf_counter()
+        with execute_wrapper_all(time_query):
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        template_time = render_time()
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.observe(view, total, db[1], db[0], template_time)
+        response['Server-Timing'] = (
+            f'total;dur={total * 1000:.1f}, '
+            f'db;dur={db[1] * 1000:.1f};desc="{db[0]} queries", '
+            f'tpl;dur={template_time * 1000:.1f}'
+        )
+        return response
@@ -0,0 +1,51 @@
+import logging
+from importlib import import_module
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from ..db import execute_wrapper_all
+
+logger = logging.getLogger(__name__)
+
+
+def get_query_budget(resolver_match):
+    """Ищем бюджет страницы в QUERY_BUDGETS модуля urls её приложения."""
+    if resolver_match is None or not resolver_match.app_name:
+        return None
+    try:
+        urls = import_module(f'{resolver_match.app_name}.urls')
+    except ImportError:
+        return None
+    budgets = getattr(urls, 'QUERY_BUDGETS', {})
+    return budgets.get(resolver_match.url_name)
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы страницы и ругается, если бюджет превышен.
+
+    Работает только при DEBUG: в бою лишняя обёртка над курсором не нужна.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with execute_wrapper_all(count_query):
+            response = self.get_response(request)
+        response['X-Query-Count'] = len(queries)
+        budget = get_query_budget(request.resolver_match)
+        if budget is not None and len(queries) > budget:
+            logger.warning(
+                'Страница %s: %d SQL-запросов при бюджете %d',
+                request.resolver_match.view_name, len(queries), budget,
+            )
+        return response
@@ -0,0 +1,39 @@
+from django.conf import settings
+
+from ..routers import read_from_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaMiddleware:
+    """Отправляет чтения лент на реплики для страниц REPLICA_VIEWS.
+
+    Какие модели читаются с реплики, решает ReplicaRouter по
+    REPLICA_MODELS.
+
+    После успешного изменяющего запроса ставит cookie, и ещё
+    REPLICA_PIN_SECONDS пользователь читает основную базу: так он
+    сразу видит свой пост, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (settings.DATABASE_REPLICAS
+                and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method not in SAFE_METHODS
+                or request.COOKIES.get(settings.REPLICA_PIN_COOKIE)
+                or request.resolver_match.view_name
+                not in settings.REPLICA_VIEWS):
+            return None
+        with read_from_replicas():
+            return view_func(request, *view_args, **view_kwargs)
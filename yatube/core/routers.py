@@ -0,0 +1,47 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+_state = threading.local()
+
+
+@contextmanager
+def read_from_replicas():
+    """Чтения моделей REPLICA_MODELS внутри блока уходят на реплику.
+
+    Реплика выбирается одна на весь блок, чтобы страница не собиралась
+    из копий с разным отставанием.
+    """
+    previous = getattr(_state, 'replica', None)
+    if settings.DATABASE_REPLICAS:
+        _state.replica = random.choice(settings.DATABASE_REPLICAS)
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+
+class ReplicaRouter:
+    """Запись — всегда в default, чтение — на реплику, если разрешено.
+
+    Реплики включает ReplicaMiddleware только для страниц из
+    REPLICA_VIEWS, и то лишь для моделей лент из REPLICA_MODELS:
+    сессия и пользователь читаются из default, иначе отставшая
+    реплика разлогинила бы только что вошедшего пользователя.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = getattr(_state, 'replica', None)
+        if (replica is not None
+                and model._meta.label_lower in settings.REPLICA_MODELS):
+            return replica
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии default: объекты из них можно связывать.
+        return True
@@ -0,0 +1,45 @@
+import gzip
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+# Сжимаем только текстовые файлы: картинки уже сжаты.
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.txt', '.xml', '.json', '.html', '.ico',
+    '.map', '.webmanifest',
+)
+
+
+def compressors():
+    yield 'gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    yield 'br', lambda data: brotli.compress(data)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest-хранилище, которое кладёт рядом .gz и .br копии.
+
+    collectstatic добавляет к имени файла хэш содержимого, а текстовые
+    файлы сжимает заранее, чтобы не жать их на каждый запрос.
+    """
+
+    def post_process(self, *args, **kwargs):
+        hashed_names = []
+        for name, hashed_name, processed in super().post_process(
+                *args, **kwargs):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.append(hashed_name)
+            yield name, hashed_name, processed
+        for hashed_name in hashed_names:
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        with self.open(name) as source:
+            data = source.read()
+        for extension, compress in compressors():
+            compressed = compress(data)
+            # Сжатая копия, которая не меньше оригинала, не нужна.
+            if len(compressed) < len(data):
+                path = self.path(f'{name}.{extension}')
+                with open(path, 'wb') as target:
+                    target.write(compressed)
@@ -0,0 +1,71 @@
+import os
+
+from django.template import (TemplateDoesNotExist, TemplateSyntaxError,
+                             engines)
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .metrics import timed_render
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timed_render():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Обычный бэкенд Django, засекающий время отрисовки для метрик."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(
+                self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def template_dirs(engine):
+    """Каталоги всех загрузчиков движка, включая обёрнутые cached."""
+    dirs = []
+    for loader in engine.template_loaders:
+        for inner in getattr(loader, 'loaders', [loader]):
+            dirs.extend(
+                str(directory) for directory in inner.get_dirs()
+                if str(directory) not in dirs)
+    return dirs
+
+
+def template_names(engine):
+    names = []
+    for directory in template_dirs(engine):
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, directory).replace(os.sep, '/')
+                if name not in names:
+                    names.append(name)
+    return names
+
+
+def precompile_templates():
+    """Разбираем все шаблоны заранее.
+
+    С cached-загрузчиком разобранные шаблоны остаются в памяти процесса.
+    Возвращает число шаблонов и список (имя, ошибка) для битых.
+    """
+    compiled = 0
+    errors = []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                errors.append((name, str(exc)))
+            else:
+                compiled += 1
+    return compiled, errors
@@ -0,0 +1,429 @@
+import gzip
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import brotli
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.contrib.auth import get_user_model
+from django.test import (Client, TestCase, TransactionTestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+from posts.urls import QUERY_BUDGETS
+
+from .admission import in_flight, take_token
+from .benchmark import (benchmark_routes, check_latency_targets,
+                        compare_results, run_benchmark, seed_dataset)
+from .mail import drain_outbox
+from .metrics import registry
+from .models import OutboxMessage
+
+User = get_user_model()
+
+
+class BenchmarkTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sample = seed_dataset(users=2, groups=2, posts=15)
+
+    def test_every_route_is_measured(self):
+        """Все страницы posts, users, about и api открываются и замеряются."""
+        results = run_benchmark(self.sample, repeat=2)
+        self.assertEqual(set(results), set(benchmark_routes()))
+        for name, result in results.items():
+            with self.subTest(route=name):
+                self.assertEqual(result['status'], 200)
+                self.assertGreater(result['bytes'], 0)
+                self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+                budget = QUERY_BUDGETS.get(name.split(':')[1])
+                if name.startswith('posts:') and budget is not None:
+                    self.assertLessEqual(result['queries'], budget)
+
+    def test_compare_results(self):
+        """Рост p95 сверх порога и лишние запросы считаются регрессией."""
+        baseline = {
+            'posts:index': {'p95_ms': 10.0, 'queries': 2},
+            'posts:profile': {'p95_ms': 10.0, 'queries': 3},
+        }
+        results = {
+            'posts:index': {'p95_ms': 11.0, 'queries': 2},
+            'posts:profile': {'p95_ms': 13.0, 'queries': 4},
+            'posts:search': {'p95_ms': 99.0, 'queries': 9},
+        }
+        regressions = compare_results(results, baseline, threshold=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(
+            line.startswith('posts:profile') for line in regressions))
+
+    def test_command_rejects_empty_dataset(self):
+        """Без групп или постов замерять нечего: понятная ошибка."""
+        for option in ('--groups', '--posts', '--users', '--repeat'):
+            with self.subTest(option=option):
+                with self.assertRaisesMessage(CommandError, option):
+                    call_command('benchmark', option, '0', stdout=StringIO())
+
+    def test_latency_targets(self):
+        """p95 API выше опубликованной цели — нарушение, другие не судим."""
+        results = {
+            'api:posts': {'p95_ms': 40.0},
+            'api:group_posts': {'p95_ms': 60.0},
+            'posts:index': {'p95_ms': 500.0},
+        }
+        violations = check_latency_targets(results, {'api': 50})
+        self.assertEqual(len(violations), 1)
+        self.assertTrue(violations[0].startswith('api:group_posts'))
+
+
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.guest_client = Client()
+
+    def test_server_timing_header(self):
+        """Ответ несёт Server-Timing со временем запроса, SQL и шаблонов."""
+        response = self.guest_client.get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        for metric in ('total;dur=', 'db;dur=', 'queries', 'tpl;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, timing)
+
+    def test_metrics_endpoint(self):
+        """/metrics отдаёт гистограммы по имени view в формате Prometheus."""
+        self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(reverse('posts:index'))
+        response = self.guest_client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE yatube_request_duration_seconds histogram',
+                      body)
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"} 2',
+            body)
+        self.assertIn(
+            'yatube_template_duration_seconds_bucket'
+            '{view="posts:index",le="+Inf"} 2', body)
+
+    def test_metrics_closed_for_other_addresses(self):
+        """Посторонним адресам /metrics недоступен."""
+        response = self.guest_client.get(
+            reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+
+class SqlitePragmasTest(TestCase):
+    def test_pragmas_applied(self):
+        """Соединение получает PRAGMA из настроек."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('Только SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(
+                cursor.fetchone()[0], settings.SQLITE_PRAGMAS['busy_timeout'])
+            cursor.execute('PRAGMA synchronous')
+            # NORMAL = 1
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_optimize_command(self):
+        """optimize_db отрабатывает и сообщает о результате."""
+        out = StringIO()
+        call_command('optimize_db', '--analyze', stdout=out)
+        self.assertIn('оптимизирована', out.getvalue())
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='HasNoName')
+        call_command('sync_replica', stdout=StringIO())
+        self.client.force_login(self.user)
+
+    def index_texts(self, client):
+        response = client.get(reverse('posts:index'))
+        return [post.text for post in response.context['page_obj']]
+
+    def test_reads_go_to_replica(self):
+        """Лента читает реплику: без синхронизации новый пост не виден."""
+        Post.objects.create(author=self.user, text='Новый пост')
+        guest = Client()
+        self.assertEqual(self.index_texts(guest), [])
+        call_command('sync_replica', stdout=StringIO())
+        cache.clear()
+        self.assertEqual(self.index_texts(guest), ['Новый пост'])
+
+    def test_author_sees_own_post(self):
+        """После создания поста автор читает основную базу."""
+        response = self.client.post(
+            reverse('posts:post_create'), {'text': 'Свой пост'})
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        self.assertEqual(
+            response.cookies[settings.REPLICA_PIN_COOKIE]['max-age'],
+            settings.REPLICA_PIN_SECONDS)
+        self.assertEqual(self.index_texts(self.client), ['Свой пост'])
+        self.assertEqual(Post.objects.using('replica').count(), 0)
+
+    def test_writes_go_to_default(self):
+        """Запись всегда уходит в default."""
+        from .routers import ReplicaRouter, read_from_replicas
+        router = ReplicaRouter()
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(Post), 'replica')
+            self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertEqual(router.db_for_read(Post), 'default')
+
+    def test_session_and_user_stay_on_default(self):
+        """Сессия и пользователь не читаются с отстающей реплики."""
+        newcomer = User.objects.create_user(username='Newcomer')
+        client = Client()
+        client.force_login(newcomer)
+        response = client.get(reverse('posts:index'))
+        self.assertEqual(response.context['user'], newcomer)
+
+    def test_one_replica_per_request(self):
+        """Реплика выбирается один раз на весь блок."""
+        from .routers import ReplicaRouter, read_from_replicas
+        router = ReplicaRouter()
+        with override_settings(DATABASE_REPLICAS=['replica', 'other']):
+            with mock.patch('core.routers.random.choice',
+                            return_value='other') as choice:
+                with read_from_replicas():
+                    for _ in range(3):
+                        self.assertEqual(router.db_for_read(Post), 'other')
+                    self.assertEqual(router.db_for_read(User), 'default')
+        choice.assert_called_once()
+
+    @override_settings(DEBUG=True)
+    def test_replica_queries_are_counted(self):
+        """X-Query-Count и Server-Timing учитывают запросы к реплике."""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = Client().get(reverse('posts:index'))
+        self.assertTrue(replica.captured_queries)
+        total = len(primary) + len(replica)
+        self.assertEqual(int(response['X-Query-Count']), total)
+        self.assertIn(f'"{total} queries"', response['Server-Timing'])
+
+
+class PrecompileTemplatesTest(TestCase):
+    def test_all_templates_compile(self):
+        """Все шаблоны проекта разбираются без ошибок."""
+        out = StringIO()
+        call_command('precompile_templates', stdout=out)
+        self.assertIn('Разобрано шаблонов', out.getvalue())
+
+    def test_syntax_error_reported(self):
+        """Битый шаблон попадает в отчёт команды."""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'broken.html'), 'w') as file:
+                file.write('{% if %}')
+            templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaisesMessage(CommandError, 'broken.html'):
+                    call_command('precompile_templates', stdout=StringIO())
+
+
+class StaticPipelineTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        storage = 'core.storage.CompressedManifestStaticFilesStorage'
+        settings_override = override_settings(
+            STATIC_ROOT=self.directory.name, STATICFILES_STORAGE=storage)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        self.css = staticfiles_storage.url('css/templatemo-style.css')
+        self.image = staticfiles_storage.url('img/image-01.jpg')
+        self.bootstrap = staticfiles_storage.url('css/bootstrap.min.css')
+
+    def test_collectstatic_hashes_and_compresses(self):
+        """Имена получают хэш, текстовые файлы — сжатую копию."""
+        self.assertRegex(self.css, r'templatemo-style\.[0-9a-f]{12}\.css$')
+        path = os.path.join(
+            self.directory.name, self.css[len(settings.STATIC_URL):])
+        self.assertTrue(os.path.exists(path + '.gz'))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.directory.name,
+                         self.image[len(settings.STATIC_URL):]) + '.gz'))
+
+    def test_brotli_copy(self):
+        """Рядом с текстовым файлом лежит и brotli-копия."""
+        path = os.path.join(
+            self.directory.name, self.css[len(settings.STATIC_URL):])
+        with open(path + '.br', 'rb') as compressed, open(path, 'rb') as raw:
+            self.assertEqual(brotli.decompress(compressed.read()), raw.read())
+        response = self.client.get(
+            self.css, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+
+    @override_settings(DEBUG=False)
+    def test_pages_render_with_manifest(self):
+        """Страницы со ссылками на статику рендерятся по манифесту."""
+        response = self.client.get(reverse('about:author'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.bootstrap)
+
+    def test_serves_precompressed_variant(self):
+        """gzip-копия отдаётся по Accept-Encoding с годовым кэшем."""
+        response = self.client.get(self.css, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        body = gzip.decompress(b''.join(response.streaming_content))
+        plain = self.client.get(self.css)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(body, b''.join(plain.streaming_content))
+
+    def test_unhashed_name_is_not_immutable(self):
+        """Файл без хэша в имени не кэшируется навсегда."""
+        response = self.client.get(
+            settings.STATIC_URL + 'css/templatemo-style.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Cache-Control', response)
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxBackend',
+    OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='HasNoName', email='user@example.com', password='pass')
+
+    def request_reset(self):
+        return self.client.post(
+            reverse('password_reset'), {'email': 'user@example.com'})
+
+    def test_reset_only_queues_mail(self):
+        """Сброс пароля ставит письмо в очередь и ничего не отправляет."""
+        with self.assertNumQueries(2):
+            response = self.request_reset()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.to, 'user@example.com')
+        self.assertIn('/reset/', message.body)
+
+    def test_drain_sends_at_rate(self):
+        """Воркер отправляет пачку, выдерживая заданный темп."""
+        for _ in range(3):
+            self.request_reset()
+        pauses = []
+        sent, failed = drain_outbox(batch_size=2, rate=10,
+                                    sleep=pauses.append)
+        self.assertEqual((sent, failed), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(len(pauses), 2)
+        self.assertTrue(all(0 < pause <= 0.1 for pause in pauses))
+        out = StringIO()
+        call_command('drain_outbox', '--rate', '1000', stdout=out)
+        self.assertIn('Отправлено писем: 1', out.getvalue())
+        self.assertFalse(OutboxMessage.objects.filter(
+            sent_at__isnull=True).exists())
+
+    @override_settings(OUTBOX_RETRY_BASE_SECONDS=60)
+    def test_failed_mail_is_retried_later(self):
+        """Ошибка отправки откладывает письмо с растущей паузой."""
+        self.request_reset()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend'
+                        '.send_messages', side_effect=OSError('down')):
+            self.assertEqual(drain_outbox(sleep=lambda pause: None), (0, 1))
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.attempts, 1)
+        self.assertEqual(message.last_error, 'down')
+        self.assertGreater(
+            message.next_attempt_at, message.created_at + timedelta(
+                seconds=59))
+        # Раньше срока письмо не берётся.
+        self.assertEqual(drain_outbox(sleep=lambda pause: None), (0, 0))
+
+
+@override_settings(WRITE_BUCKET_CAPACITY=2, WRITE_BUCKET_REFILL_PER_SECOND=0.5)
+class WriteAdmissionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.user = User.objects.create_user(username='HasNoName')
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_create')
+
+    def create(self, text='Текст'):
+        return self.client.post(self.url, {'text': text})
+
+    def test_bucket_throttles_burst(self):
+        """Всплеск записей одного пользователя получает 429."""
+        self.assertEqual(self.create().status_code, 302)
+        self.assertEqual(self.create().status_code, 302)
+        response = self.create()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '2')
+        self.assertEqual(Post.objects.count(), 2)
+        # Чтение формы не тратит токены.
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn(
+            'yatube_write_rejections_total'
+            '{reason="throttled",view="posts:post_create"} 1', body)
+
+    def test_bucket_refills(self):
+        """Ведро пополняется со временем."""
+        now = 1000.0
+        self.assertEqual(take_token(self.user.pk, now), 0)
+        self.assertEqual(take_token(self.user.pk, now), 0)
+        self.assertEqual(take_token(self.user.pk, now), 2)
+        self.assertEqual(take_token(self.user.pk, now + 2), 0)
+
+    @override_settings(WRITE_MAX_IN_FLIGHT=1)
+    def test_in_flight_limit(self):
+        """Когда все слоты записи заняты, запрос сразу получает 429."""
+        self.assertTrue(in_flight.try_acquire())
+        try:
+            response = self.create()
+        finally:
+            in_flight.release()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(self.create().status_code, 302)
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('reason="busy"', body)
+        self.assertIn('yatube_writes_in_flight 0', body)
+
+    @override_settings(WRITE_MAX_IN_FLIGHT=1)
+    def test_busy_rejection_keeps_token(self):
+        """Отказ «занято» не тратит токен пользователя."""
+        self.assertTrue(in_flight.try_acquire())
+        try:
+            for _ in range(3):
+                self.assertEqual(self.create().status_code, 429)
+        finally:
+            in_flight.release()
+        self.assertEqual(self.create().status_code, 302)
+        self.assertEqual(self.create().status_code, 302)
+
+    def test_in_flight_gauge_survives_clear(self):
+        """Gauge показывает занятые слоты и после сброса registry."""
+        self.assertTrue(in_flight.try_acquire())
+        try:
+            registry.clear()
+            body = self.client.get(reverse('metrics')).content.decode()
+        finally:
+            in_flight.release()
+        self.assertIn('yatube_writes_in_flight 1', body)
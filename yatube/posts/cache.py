@@ -0,0 +1,188 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+from .paginator import decode_cursor
+
+CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def post_version_key(post_id):
+    return f'post-version:{post_id}'
+
+
+def author_version_key(author_id):
+    return f'author-version:{author_id}'
+
+
+def group_version_key(group_id):
+    return f'group-version:{group_id}'
+
+
+def initial_version():
+    # Если ключ версии вытеснили из кэша, новая версия в миллисекундах
+    # всё равно окажется больше старой — устаревший фрагмент не всплывёт.
+    return int(time.time() * 1000)
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, initial_version(), None)
+
+
+def get_versions(keys):
+    """Читаем версии одним get_many; недостающие заводим заново."""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = initial_version()
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+            versions[key] = version
+    return versions
+
+
+def card_key(post, show_group, versions):
+    return 'post-card:{}:{}:{}:{}:{}'.format(
+        post.pk,
+        int(show_group),
+        versions[post_version_key(post.pk)],
+        versions[author_version_key(post.author_id)],
+        versions.get(group_version_key(post.group_id), 0),
+    )
+
+
+def render_post_cards(posts, show_group=True):
+    """Достаём карточки постов из кэша, рендеря только недостающие."""
+    posts = list(posts)
+    version_keys = set()
+    for post in posts:
+        version_keys.add(post_version_key(post.pk))
+        version_keys.add(author_version_key(post.author_id))
+        if post.group_id is not None:
+            version_keys.add(group_version_key(post.group_id))
+    versions = get_versions(list(version_keys))
+    keys = [card_key(post, show_group, versions) for post in posts]
+    cached = cache.get_many(keys)
+    missing = {}
+    fragments = []
+    for post, key in zip(posts, keys):
+        fragment = cached.get(key)
+        if fragment is None:
+            fragment = render_to_string(
+                CARD_TEMPLATE, {'post': post, 'show_group': show_group})
+            missing[key] = fragment
+        fragments.append(fragment)
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    return fragments
+
+
+# Страничный кэш для анонимов. Каждая лента — своя область (scope)
+# со своей версией; запись поднимает версии только задетых областей.
+
+
+def hashed(value):
+    # Slug и username бывают не ASCII: в ключ кэша идёт их хэш,
+    # как в make_template_fragment_key.
+    return hashlib.md5(str(value).encode()).hexdigest()
+
+
+def index_scope():
+    return 'page-version:index'
+
+
+def group_scope(slug):
+    return f'page-version:group:{hashed(slug)}'
+
+
+def profile_scope(username):
+    return f'page-version:profile:{hashed(username)}'
+
+
+def directory_scope():
+    return 'page-version:groups'
+
+
+def invalidate_pages(*scopes):
+    for scope in set(scopes):
+        bump_version(scope)
+
+
+def canonical_params(query, sorts=()):
+    """Параметры страницы в каноническом виде для ключа кэша.
+
+    Значения, которые view всё равно проигнорирует, отбрасываются,
+    чтобы мусор в ?page= и ?after= не плодил копии одной страницы.
+    Для страниц, которые не кэшируем (page=0, дальше
+    PAGE_CACHE_MAX_PAGE), возвращает None.
+    """
+    params = []
+    page = query.get('page')
+    if page is not None:
+        try:
+            number = int(page)
+        except ValueError:
+            # Paginator.get_page покажет первую страницу.
+            number = 1
+        if not 1 <= number <= settings.PAGE_CACHE_MAX_PAGE:
+            # Ноль, минус и хвост Paginator отдаёт как последнюю страницу.
+            return None
+        if number > 1:
+            params.append(f'page={number}')
+    for name in ('after', 'before'):
+        token = query.get(name)
+        if token and decode_cursor(token) is not None:
+            params.append(f'{name}={token}')
+    sort = query.get('sort')
+    if sort in sorts:
+        params.append(f'sort={sort}')
+    return '&'.join(params)
+
+
+def page_key(request, scope, version, sorts=()):
+    """Ключ страницы в кэше или None, если её не кэшируем."""
+    params = canonical_params(request.GET, sorts)
+    if params is None:
+        return None
+    return 'page:{}:{}:{}'.format(
+        scope, version, hashed(f'{request.path}?{params}'))
+
+
+def anonymous_page_cache(scope_for, sorts=()):
+    """Кэшируем страницу целиком для неавторизованных пользователей.
+
+    scope_for получает аргументы view и возвращает ключ области,
+    sorts — допустимые значения ?sort= этой страницы.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            scope = scope_for(*args, **kwargs)
+            version = get_versions([scope])[scope]
+            key = page_key(request, scope, version, sorts)
+            if key is None:
+                return view(request, *args, **kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                cache.set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    settings.PAGE_CACHE_TIMEOUT,
+                )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.db.models import Exists, OuterRef
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from .cache import get_versions, group_scope, profile_scope
+from .models import Follow, Group, Post, User
+
+
+def make_etag(request, *parts):
+    # Страница зависит от того, кто смотрит: шапка и кнопка правки.
+    raw = repr((request.user.pk,) + parts).encode()
+    return quote_etag(hashlib.md5(raw).hexdigest())
+
+
+def page_version(scope):
+    """Версия области страничного кэша.
+
+    Сигналы поднимают её при любой правке, видной на странице ленты,
+    в том числе при смене имени автора, которой нет в датах постов.
+    """
+    return get_versions([scope])[scope]
+
+
+def post_detail_validators(request, post_id):
+    row = Post.objects.filter(pk=post_id).values_list(
+        'updated_at',
+        'author__first_name',
+        'author__last_name',
+        'author__stats__post_count',
+        'group__title',
+        'group__slug',
+    ).first()
+    if row is None:
+        return None
+    return row[0], make_etag(request, *row)
+
+
+def group_validators(request, slug):
+    # Одна строка группы и её счётчиков вместо агрегата по всем постам.
+    # Удаление поста, правки группы и авторов видны только по версии
+    # страничного кэша, поэтому Last-Modified здесь не отдаём.
+    row = Group.objects.filter(slug=slug).values_list(
+        'title', 'description', 'stats__post_count',
+        'stats__last_post_date').first()
+    if row is None:
+        return None
+    return None, make_etag(request, page_version(group_scope(slug)), *row)
+
+
+def profile_validators(request, username):
+    users = User.objects.filter(username=username)
+    fields = ['first_name', 'last_name', 'stats__post_count',
+              'stats__last_post_date']
+    if request.user.is_authenticated:
+        # Кнопка «Подписаться/Отписаться» зависит от зрителя.
+        users = users.annotate(viewer_follows=Exists(Follow.objects.filter(
+            user=request.user, author=OuterRef('pk'))))
+        fields.append('viewer_follows')
+    row = users.values_list(*fields).first()
+    if row is None:
+        return None
+    return None, make_etag(
+        request, page_version(profile_scope(username)), *row)
+
+
+def conditional_page(validators_for):
+    """Отвечаем 304 по ETag/Last-Modified, не вызывая view.
+
+    validators_for делает один запрос и возвращает (last_modified, etag)
+    или None, если объекта нет; last_modified может быть None.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            validators = validators_for(request, *args, **kwargs)
+            if validators is None:
+                return view(request, *args, **kwargs)
+            last_modified, etag = validators
+            timestamp = None
+            # Last-Modified не знает о пользователе, поэтому отдаём его
+            # только анонимам; авторизованным хватает ETag.
+            if last_modified is not None and not request.user.is_authenticated:
+                timestamp = timegm(last_modified.utctimetuple())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                if timestamp is not None:
+                    response['Last-Modified'] = http_date(timestamp)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Post
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Имена колонок совпадают с форматом import_posts.
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('text', 'text'),
+    ('pub_date', 'pub_date'),
+    ('author', 'author__username'),
+    ('group', 'group__slug'),
+)
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class ExportFilterError(ValueError):
+    pass
+
+
+def parse_moment(value, end_of_day=False):
+    """Дата или дата-время из ISO 8601; дата без времени — граница суток."""
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        # Формат верный, но такой даты нет: 2020-02-30, 2020-13-01.
+        raise ExportFilterError(f'Несуществующая дата {value!r}')
+    if moment is None:
+        if day is None:
+            raise ExportFilterError(f'Не понимаю дату {value!r}')
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.utc)
+    return moment
+
+
+def export_rows(group=None, author=None, since=None, until=None,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    """Кортежи постов по возрастанию id, без создания объектов Post."""
+    posts = Post.objects.order_by('pk')
+    if group:
+        posts = posts.filter(group__slug=group)
+    if author:
+        posts = posts.filter(author__username=author)
+    since = parse_moment(since)
+    until = parse_moment(until, end_of_day=True)
+    if since is not None:
+        posts = posts.filter(pub_date__gte=since)
+    if until is not None:
+        posts = posts.filter(pub_date__lte=until)
+    fields = [field for _, field in EXPORT_COLUMNS]
+    return posts.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def ndjson_lines(rows):
+    names = [name for name, _ in EXPORT_COLUMNS]
+    for row in rows:
+        record = dict(zip(names, row))
+        record['pub_date'] = record['pub_date'].isoformat()
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+class LineBuffer:
+    """Файлоподобный объект: csv.writer отдаёт строку, а не пишет её."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for row in rows:
+        row = list(row)
+        row[2] = row[2].isoformat()
+        yield writer.writerow(row)
+
+
+SERIALIZERS = {
+    'jsonl': ndjson_lines,
+    'csv': csv_lines,
+}
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import transaction
+
+from core.background import submit_on_commit
+
+from .models import FeedItem, Follow, Post
+
+
+def follower_ids(author_id):
+    return Follow.objects.filter(author_id=author_id).values_list(
+        'user_id', flat=True)
+
+
+def write_feed_items(post, user_ids):
+    # FANOUT_BATCH_SIZE режет список подписчиков, а размер INSERT
+    # выбирает Django: у SQLite свой предел строк в одном запросе.
+    FeedItem.objects.bulk_create(
+        (FeedItem(user_id=user_id, post_id=post.pk,
+                  author_id=post.author_id, pub_date=post.pub_date)
+         for user_id in user_ids),
+        ignore_conflicts=True,
+    )
+
+
+def fan_out_post(post):
+    """Раскладываем новый пост в ленты подписчиков автора.
+
+    Немногих подписчиков обслуживаем сразу, большую аудиторию —
+    пачками в фоновом воркере после коммита.
+    """
+    limit = settings.FANOUT_INLINE_LIMIT
+    user_ids = list(follower_ids(post.author_id)[:limit + 1])
+    if len(user_ids) <= limit:
+        write_feed_items(post, user_ids)
+    else:
+        submit_on_commit(fan_out_in_batches, post.pk)
+
+
+def fan_out_in_batches(post_id):
+    post = Post.objects.filter(pk=post_id).only(
+        'pk', 'author_id', 'pub_date').first()
+    if post is None:
+        return
+    last_user_id = 0
+    while True:
+        batch = list(follower_ids(post.author_id).filter(
+            user_id__gt=last_user_id).order_by(
+            'user_id')[:settings.FANOUT_BATCH_SIZE])
+        if not batch:
+            return
+        with transaction.atomic():
+            write_feed_items(post, batch)
+        last_user_id = batch[-1]
+
+
+def refan_post(post):
+    """Пост сменил автора: убираем его из старых лент и раскладываем."""
+    FeedItem.objects.filter(post_id=post.pk).delete()
+    fan_out_post(post)
+
+
+def follow(user, author):
+    """Подписка; последние посты автора сразу попадают в ленту."""
+    if user == author:
+        return False
+    _, created = Follow.objects.get_or_create(user=user, author=author)
+    if created:
+        posts = author.posts.order_by('-pub_date', '-pk').only(
+            'pk', 'author_id', 'pub_date')[:settings.FOLLOW_BACKFILL_POSTS]
+        FeedItem.objects.bulk_create(
+            (FeedItem(user=user, post_id=post.pk, author_id=author.pk,
+                      pub_date=post.pub_date) for post in posts),
+            ignore_conflicts=True,
+        )
+    return created
+
+
+def unfollow(user, author):
+    Follow.objects.filter(user=user, author=author).delete()
+    FeedItem.objects.filter(user=user, author=author).delete()
@@ -0,0 +1,152 @@
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, parse_http_date_safe
+
+from . import cache as post_cache
+from .models import Group, Post, User
+
+
+def cached_feed(scope_for):
+    """Кэшируем тело ленты до изменения постов в её области.
+
+    Версия области и готовая лента читаются одним get_many, так что
+    опрос без изменений стоит одного обращения к кэшу.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            scope = scope_for(*args, **kwargs)
+            key = f'feed:{post_cache.hashed(request.path)}'
+            found = cache.get_many([scope, key])
+            version = found.get(scope)
+            entry = found.get(key)
+            if entry is None or version is None or entry[0] != version:
+                version = post_cache.get_versions([scope])[scope]
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                # Last-Modified Feed считает по датам правки постов.
+                entry = (
+                    version,
+                    response.content,
+                    response['Content-Type'],
+                    parse_http_date_safe(response.get('Last-Modified')),
+                )
+                cache.set(key, entry, settings.FEED_CACHE_TIMEOUT)
+            version, content, content_type, timestamp = entry
+            etag = quote_etag(f'{version}')
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = HttpResponse(content, content_type=content_type)
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+            return response
+        return wrapper
+    return decorator
+
+
+class PostFeed(Feed):
+    """Общая часть лент: последние посты со ссылками на страницы."""
+
+    def get_posts(self, obj):
+        return Post.objects.select_related('author', 'group')
+
+    def items(self, obj):
+        return self.get_posts(obj)[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return str(item)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', kwargs={'post_id': item.pk})
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+
+class IndexFeed(PostFeed):
+    title = 'Yatube: последние записи'
+    description = 'Новые записи всех авторов.'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupFeed(PostFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def get_posts(self, obj):
+        return obj.posts.select_related('author', 'group')
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('posts:posts_group', kwargs={'slug': obj.slug})
+
+
+class AuthorFeed(PostFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, obj):
+        return obj.posts.select_related('author', 'group')
+
+    def title(self, obj):
+        return f'Yatube: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Записи пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('posts:profile', kwargs={'username': obj.username})
+
+
+class AtomIndexFeed(IndexFeed):
+    feed_type = Atom1Feed
+    subtitle = IndexFeed.description
+
+
+class AtomGroupFeed(GroupFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+index_rss = cached_feed(post_cache.index_scope)(IndexFeed())
+index_atom = cached_feed(post_cache.index_scope)(AtomIndexFeed())
+group_rss = cached_feed(post_cache.group_scope)(GroupFeed())
+group_atom = cached_feed(post_cache.group_scope)(AtomGroupFeed())
+profile_rss = cached_feed(post_cache.profile_scope)(AuthorFeed())
+profile_atom = cached_feed(post_cache.profile_scope)(AtomAuthorFeed())
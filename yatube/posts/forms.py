@@ -1,6 +1,8 @@
 from django import forms
+from django.urls import reverse_lazy
 
 from .models import Post
+from .widgets import GroupAutocomplete
 
 
 class PostForm(forms.ModelForm):
@@ -15,3 +17,21 @@ class PostForm(forms.ModelForm):
             'text': ('Внесите текст какой-нибудь текст:'),
             'group': ('Выберите группу:'),
         }
+        widgets = {
+            'group': GroupAutocomplete(
+                url=reverse_lazy('posts:group_autocomplete')),
+        }
+
+
+class PostImageForm(forms.ModelForm):
+    """Картинка поста отдельной формой: PostForm остаётся из двух полей."""
+
+    class Meta:
+        model = Post
+        fields = ('image',)
+        labels = {
+            'image': ('Картинка'),
+        }
+        help_texts = {
+            'image': ('Загрузите картинку к посту:'),
+        }
@@ -0,0 +1,188 @@
+import csv
+import json
+from contextlib import contextmanager
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Group, Post, User
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+class InvalidRow(dict):
+    """Строка, которую не удалось разобрать.
+
+    Остаётся в потоке, чтобы номер строки для контрольной точки не
+    сбился, а build_post пропускает её с ошибкой.
+    """
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield InvalidRow(f'не JSON: {error}')
+            continue
+        if not isinstance(row, dict):
+            yield InvalidRow(f'не объект JSON: {line[:50]!r}')
+            continue
+        yield row
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def keep_dates():
+    """Отключаем auto_now/auto_now_add, чтобы сохранить даты архива.
+
+    Меняет поля модели на уровне процесса: годится для команды
+    импорта, но не для кода, работающего внутри веб-сервера.
+    """
+    fields = [Post._meta.get_field(name) for name in ('pub_date',
+                                                      'updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def string_field(row, name):
+    """Значение поля строки; всё, кроме строки и None, — ошибка."""
+    value = row.get(name)
+    if value is not None and not isinstance(value, str):
+        raise ImportRowError(f'поле {name} не строка: {value!r}')
+    return value
+
+
+def parse_pub_date(value):
+    """Дата поста из ISO 8601; без даты — текущий момент."""
+    if not value:
+        return timezone.now()
+    try:
+        pub_date = parse_datetime(value)
+    except ValueError:
+        # Формат верный, но такой даты нет: 2020-02-30.
+        pub_date = None
+    if pub_date is None:
+        raise ImportRowError(f'плохая дата {value!r}')
+    if timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date, timezone.utc)
+    return pub_date
+
+
+class Lookup:
+    """Кэш username -> id и slug -> id, дозагружаемый пачками."""
+
+    def __init__(self, create_authors=False, create_groups=False):
+        self.authors = {}
+        self.groups = {}
+        self.create_authors = create_authors
+        self.create_groups = create_groups
+
+    def load(self, rows):
+        usernames = {
+            row.get('author') for row in rows
+            if isinstance(row.get('author'), str)
+        } - set(self.authors)
+        if usernames:
+            self.authors.update(User.objects.filter(
+                username__in=usernames).values_list('username', 'id'))
+            missing = usernames - set(self.authors)
+            if missing and self.create_authors:
+                User.objects.bulk_create(
+                    User(username=name, password=make_password(None))
+                    for name in missing
+                )
+                self.authors.update(User.objects.filter(
+                    username__in=missing).values_list('username', 'id'))
+        slugs = {
+            row.get('group') for row in rows
+            if isinstance(row.get('group'), str)
+        } - set(self.groups)
+        slugs.discard('')
+        if slugs:
+            self.groups.update(Group.objects.filter(
+                slug__in=slugs).values_list('slug', 'id'))
+            missing = slugs - set(self.groups)
+            if missing and self.create_groups:
+                Group.objects.bulk_create(
+                    Group(title=slug, slug=slug, description='')
+                    for slug in missing
+                )
+                self.groups.update(Group.objects.filter(
+                    slug__in=missing).values_list('slug', 'id'))
+
+    def build_post(self, row):
+        if isinstance(row, InvalidRow):
+            raise ImportRowError(row.error)
+        text = string_field(row, 'text')
+        if not text:
+            raise ImportRowError('нет текста')
+        author = string_field(row, 'author')
+        author_id = self.authors.get(author)
+        if author_id is None:
+            raise ImportRowError(f'неизвестный автор {author!r}')
+        group_id = None
+        group = string_field(row, 'group')
+        if group:
+            group_id = self.groups.get(group)
+            if group_id is None:
+                raise ImportRowError(f'неизвестная группа {group!r}')
+        pub_date = parse_pub_date(string_field(row, 'pub_date'))
+        return Post(text=text, author_id=author_id, group_id=group_id,
+                    pub_date=pub_date, updated_at=pub_date)
+
+
+def import_chunk(rows, lookup):
+    """Вставляем пачку одной транзакцией; возвращаем (вставлено, ошибки)."""
+    with transaction.atomic():
+        lookup.load(rows)
+        posts = []
+        errors = []
+        for row in rows:
+            try:
+                posts.append(lookup.build_post(row))
+            except ImportRowError as error:
+                errors.append(str(error))
+        with keep_dates():
+            # Размер INSERT выбирает Django: SQLite не примет больше
+            # 500 строк или 999 параметров в одном запросе.
+            Post.objects.bulk_create(posts)
+    return len(posts), errors
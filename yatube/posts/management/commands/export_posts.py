@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.exporter import (DEFAULT_CHUNK_SIZE, SERIALIZERS,
+                            ExportFilterError, export_rows)
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает посты в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=sorted(SERIALIZERS), default='jsonl')
+        parser.add_argument('--output', help='Файл; по умолчанию stdout.')
+        parser.add_argument('--group', help='Slug группы.')
+        parser.add_argument('--author', help='Username автора.')
+        parser.add_argument('--since', help='С даты (ISO 8601).')
+        parser.add_argument('--until', help='По дату (ISO 8601).')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Сколько строк забирать из базы за раз.')
+
+    def handle(self, *args, **options):
+        try:
+            rows = export_rows(
+                group=options['group'],
+                author=options['author'],
+                since=options['since'],
+                until=options['until'],
+                chunk_size=options['chunk_size'],
+            )
+        except ExportFilterError as error:
+            raise CommandError(error)
+        lines = SERIALIZERS[options['format']](rows)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
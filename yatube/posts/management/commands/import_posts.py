@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.importer import (DEFAULT_BATCH_SIZE, READERS, Lookup, chunked,
+                            import_chunk)
+from posts.signals import invalidate_directory, invalidate_post_pages
+from posts.stats import rebuild_author_stats, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково импортирует посты из JSONL или CSV (файл или stdin). '
+        'Поля: text, author (username), group (slug), pub_date (ISO 8601).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'source', help='Путь к файлу или "-" для stdin.')
+        parser.add_argument(
+            '--format', choices=sorted(READERS),
+            help='Формат данных; по умолчанию — по расширению файла.')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Строк в одной транзакции и одном bulk_create.')
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл с числом обработанных строк для продолжения импорта.')
+        parser.add_argument(
+            '--create-authors', action='store_true',
+            help='Создавать неизвестных авторов без пароля.')
+        parser.add_argument(
+            '--create-groups', action='store_true',
+            help='Создавать неизвестные группы по slug.')
+        parser.add_argument(
+            '--no-rebuild', action='store_true',
+            help='Не пересобирать счётчики после импорта.')
+
+    def get_format(self, options):
+        if options['format']:
+            return options['format']
+        extension = os.path.splitext(options['source'])[1].lstrip('.')
+        if extension in READERS:
+            return extension
+        if extension == 'ndjson':
+            return 'jsonl'
+        raise CommandError('Не удалось определить формат, укажите --format.')
+
+    def read_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return 0
+        with open(path) as checkpoint:
+            return int(checkpoint.read().strip() or 0)
+
+    def write_checkpoint(self, path, done):
+        if not path:
+            return
+        # Пишем через временный файл, чтобы не оставить его пустым.
+        with open(f'{path}.tmp', 'w') as checkpoint:
+            checkpoint.write(str(done))
+        os.replace(f'{path}.tmp', path)
+
+    def refresh_after_import(self, lookup):
+        # bulk_create обходит сигналы: счётчики и кэш обновляем сами.
+        rebuild_author_stats()
+        rebuild_counters()
+        invalidate_post_pages()
+        for author_ids in chunked(lookup.authors.values(), 500):
+            invalidate_post_pages(author_ids)
+        for group_ids in chunked(lookup.groups.values(), 500):
+            invalidate_post_pages(group_ids=group_ids)
+        invalidate_directory(*lookup.groups.values())
+
+    def handle(self, *args, **options):
+        reader = READERS[self.get_format(options)]
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        checkpoint = options['checkpoint']
+        skip = self.read_checkpoint(checkpoint)
+        lookup = Lookup(options['create_authors'], options['create_groups'])
+
+        if options['source'] == '-':
+            stream = sys.stdin
+        else:
+            stream = open(options['source'], newline='', encoding='utf-8')
+        done = skip
+        imported = failed = 0
+        started = time.monotonic()
+        try:
+            rows = reader(stream)
+            for _ in range(skip):
+                next(rows, None)
+            for chunk in chunked(rows, batch_size):
+                inserted, errors = import_chunk(chunk, lookup)
+                done += len(chunk)
+                imported += inserted
+                failed += len(errors)
+                for error in errors:
+                    self.stderr.write(f'Пропущена строка: {error}')
+                self.write_checkpoint(checkpoint, done)
+                elapsed = time.monotonic() - started
+                self.stderr.write(
+                    f'Обработано {done} строк, вставлено {imported}, '
+                    f'{imported / elapsed if elapsed else 0:.0f} строк/с'
+                )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if not options['no_rebuild']:
+            self.refresh_after_import(lookup)
+        if checkpoint and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано {imported} постов, пропущено {failed}.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.stats import REBUILD_BATCH_SIZE, rebuild_author_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает таблицу AuthorStats по всем постам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=REBUILD_BATCH_SIZE,
+            help='Сколько строк вставлять за один bulk_create.',
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_author_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика пересобрана для {total} авторов.'))
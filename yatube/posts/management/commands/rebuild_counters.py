@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import directory_scope, invalidate_pages
+from posts.stats import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает счётчики постов групп и общий счётчик постов.'
+
+    def handle(self, *args, **options):
+        total = rebuild_counters()
+        invalidate_pages(directory_scope())
+        self.stdout.write(self.style.SUCCESS(
+            f'Счётчики пересобраны для {total} групп.'))
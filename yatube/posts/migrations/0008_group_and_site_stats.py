@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    SiteStats = apps.get_model('posts', 'SiteStats')
+    db_alias = schema_editor.connection.alias
+    rows = Post.objects.using(db_alias).filter(group__isnull=False).order_by().values(
+        'group_id').annotate(
+        post_count=models.Count('id'),
+        last_post_date=models.Max('pub_date'),
+    )
+    GroupStats.objects.using(db_alias).bulk_create(
+        (GroupStats(**row) for row in rows.iterator()))
+    SiteStats.objects.using(db_alias).create(
+        pk=1, post_count=Post.objects.using(db_alias).count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('last_post_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SiteStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
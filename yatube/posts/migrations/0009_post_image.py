@@ -0,0 +1,43 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:33
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# SQLite добавляет поля пересозданием таблицы posts_post, и триггеры
+# FTS5 из 0007 пропадают вместе со старой таблицей: создаём их заново.
+fts = import_module('posts.migrations.0007_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_group_and_site_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, height_field='image_height', upload_to='posts/', verbose_name='Картинка', width_field='image_width'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_height',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_width',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnails_ready',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(
+            fts.run_on_sqlite(fts.DROP_FTS + fts.CREATE_FTS),
+            migrations.RunPython.noop,
+        ),
+    ]
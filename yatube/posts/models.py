@@ -7,7 +7,8 @@ User = get_user_model()
 
 
 class Group(models.Model):
-    title = models.CharField(max_length=200)
+    # Индекс нужен автодополнению: поиск по префиксу названия.
+    title = models.CharField(max_length=200, db_index=True)
     slug = models.SlugField(unique=True)
     description = models.TextField()
 
@@ -18,6 +19,7 @@ class Group(models.Model):
 class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -30,12 +32,154 @@ class Post(models.Model):
         on_delete=models.SET_NULL,
         related_name='posts'
     )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True,
+        width_field='image_width',
+        height_field='image_height',
+    )
+    # Размеры заполняет ImageField: шаблонам не нужно открывать файл.
+    image_width = models.PositiveIntegerField(null=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    # Миниатюры готовит фоновый воркер (posts.thumbnails).
+    thumbnails_ready = models.BooleanField(default=False, editable=False)
 
     class Meta:
         ordering = ['-pub_date']
+        # Ленты фильтруют по автору или группе и сортируют по дате;
+        # id в конце индекса нужен для keyset-пагинации.
+        indexes = [
+            models.Index(fields=['author', '-pub_date', '-id'],
+                         name='post_author_pub_date_idx'),
+            models.Index(fields=['group', '-pub_date', '-id'],
+                         name='post_group_pub_date_idx'),
+            models.Index(fields=['-pub_date', '-id'],
+                         name='post_pub_date_id_idx'),
+            # Валидаторы условных GET: MAX(updated_at) по автору и группе.
+            models.Index(fields=['author', 'updated_at'],
+                         name='post_author_updated_idx'),
+            models.Index(fields=['group', 'updated_at'],
+                         name='post_group_updated_idx'),
+        ]
 
     def get_absolute_url(self):
         return reverse('post', kwargs={'slug': self.slug})
 
     def __str__(self):
         return self.text[:15]
+
+
+class AuthorStats(models.Model):
+    """Готовая статистика автора для профиля и страницы поста.
+
+    Поддерживается сигналами Post (posts.signals), пересобирается
+    командой rebuild_author_stats.
+    """
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    post_count = models.PositiveIntegerField(default=0)
+    last_post_date = models.DateTimeField(blank=True, null=True)
+    group_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.author}: {self.post_count}'
+
+
+class GroupStats(models.Model):
+    """Счётчики группы: число постов и дата последнего."""
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    post_count = models.PositiveIntegerField(default=0)
+    last_post_date = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f'{self.group}: {self.post_count}'
+
+
+class SiteStats(models.Model):
+    """Единственная строка с общим числом постов для главной."""
+    SINGLETON_ID = 1
+
+    post_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'Всего постов: {self.post_count}'
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'author'],
+                                    name='unique_follow'),
+            models.CheckConstraint(check=~models.Q(user=models.F('author')),
+                                   name='no_self_follow'),
+        ]
+        # Раскладка поста читает подписчиков автора пачками по user_id.
+        indexes = [
+            models.Index(fields=['author', 'user'],
+                         name='follow_author_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user} → {self.author}'
+
+
+class FeedItem(models.Model):
+    """Строка материализованной ленты подписок пользователя.
+
+    Заполняется при публикации поста (posts.fanout), поэтому страница
+    подписок читает только строки одного пользователя.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_items'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='feed_items'
+    )
+    # Копии полей поста: отписка и сортировка обходятся без JOIN.
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-pub_date', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'],
+                                    name='unique_feed_item'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-pub_date', '-id'],
+                         name='feed_user_pub_date_idx'),
+            models.Index(fields=['user', 'author'],
+                         name='feed_user_author_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.post_id}'
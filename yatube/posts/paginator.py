@@ -0,0 +1,160 @@
+import base64
+import binascii
+
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+
+
+def cursor_key(row):
+    """Ключ (pub_date, id) поста или словаря из .values()."""
+    if isinstance(row, dict):
+        return row['pub_date'], row['id']
+    return row.pub_date, row.pk
+
+
+def encode_cursor(row):
+    """Упаковываем ключ (pub_date, id) поста в непрозрачный токен."""
+    pub_date, pk = cursor_key(row)
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Распаковываем токен; на любой мусор возвращаем None."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        pub_date, pk = raw.rsplit('|', 1)
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+class WindowedPage(Page):
+    """Страница, которая знает только соседние номера страниц."""
+
+    @property
+    def page_window(self):
+        return self.paginator.page_window(self.number)
+
+
+class CountedPaginator(Paginator):
+    """Paginator, берущий общее число постов из готового счётчика.
+
+    Если счётчика нет (count=None), считает COUNT(*) как обычно.
+    В шаблон отдаётся окно номеров вокруг текущей страницы, а не весь
+    page_range.
+    """
+
+    def __init__(self, object_list, per_page, count=None, window=2,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+        self.window = window
+
+    @cached_property
+    def count(self):
+        if self._known_count is not None:
+            return self._known_count
+        return super().count
+
+    def page_window(self, number):
+        first = max(1, number - self.window)
+        last = min(self.num_pages, number + self.window)
+        return range(first, last + 1)
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class CursorPage(Page):
+    """Страница keyset-пагинации.
+
+    Номера страницы нет: вместо него токены соседних страниц.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        super().__init__(object_list, None, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return encode_cursor(self.object_list[0])
+        return None
+
+
+class CursorPaginator(Paginator):
+    """Keyset-пагинация по (pub_date, id) вместо LIMIT/OFFSET.
+
+    Порядок совпадает с Post.Meta.ordering (новые сверху), а id
+    разрешает одинаковые даты. Стоимость страницы не зависит от её
+    глубины, и COUNT(*) не выполняется.
+    """
+
+    is_cursor = True
+
+    def forward_queryset(self, after_key=None):
+        """Посты после ключа, от новых к старым."""
+        posts = self.object_list
+        if after_key is not None:
+            pub_date, pk = after_key
+            # Лишнее условие pub_date__lte даёт SQLite поиск по диапазону
+            # индекса вместо сканирования с начала ленты.
+            posts = posts.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk),
+                pub_date__lte=pub_date,
+            )
+        return posts.order_by('-pub_date', '-pk')[:self.per_page + 1]
+
+    def backward_queryset(self, before_key):
+        """Посты перед ключом, от старых к новым."""
+        pub_date, pk = before_key
+        return self.object_list.filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk),
+            pub_date__gte=pub_date,
+        ).order_by('pub_date', 'pk')[:self.per_page + 1]
+
+    def get_page(self, after=None, before=None):
+        before_key = decode_cursor(before)
+        if before_key is not None:
+            rows = list(self.backward_queryset(before_key))
+            if len(rows) <= self.per_page:
+                # Дошли до начала ленты: отдаём полную первую страницу.
+                return self.get_page()
+            rows = rows[:self.per_page]
+            rows.reverse()
+            return CursorPage(rows, self, True, True)
+        after_key = decode_cursor(after)
+        rows = list(self.forward_queryset(after_key))
+        has_next = len(rows) > self.per_page
+        return CursorPage(
+            rows[:self.per_page], self, has_next, after_key is not None)
+
+    @property
+    def page_range(self):
+        return range(0)
@@ -0,0 +1,124 @@
+import base64
+import binascii
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+from .models import Post
+
+# Маркеры подсветки, которых не бывает в тексте: экранируем сниппет
+# целиком и только потом превращаем их в <mark>.
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_TOKENS = 24
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(query):
+    """Превращаем пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово берём в кавычки (операторы FTS5 не сработают), слова
+    объединяются через AND, последнее ищется по префиксу.
+    """
+    words = query.split()
+    if not words:
+        return ''
+    terms = ['"{}"'.format(word.replace('"', '""')) for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def encode_search_cursor(rank, pk):
+    raw = f'{rank!r}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_search_cursor(token):
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        rank, pk = base64.urlsafe_b64decode(
+            padded.encode()).decode().rsplit('|', 1)
+        return float(rank), int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def highlight(snippet):
+    return escape(snippet).replace(
+        MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def search_posts(query, limit, after=None):
+    """Ищем посты по bm25 с keyset-пагинацией по (rank, id).
+
+    Возвращает (список (post, сниппет), токен следующей страницы).
+    """
+    match = match_expression(query)
+    if not match or not fts_available():
+        return [], None
+    sql = [
+        'SELECT rowid, rank, snippet(posts_post_fts, 0, %s, %s, %s, %s)',
+        'FROM posts_post_fts WHERE posts_post_fts MATCH %s',
+    ]
+    params = [MARK_START, MARK_END, '…', SNIPPET_TOKENS, match]
+    after_key = decode_search_cursor(after)
+    if after_key is not None:
+        sql.append('AND (rank > %s OR (rank = %s AND rowid > %s))')
+        params += [after_key[0], after_key[0], after_key[1]]
+    sql.append('ORDER BY rank, rowid LIMIT %s')
+    params.append(limit + 1)
+    with connection.cursor() as cursor:
+        cursor.execute(' '.join(sql), params)
+        rows = cursor.fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_search_cursor(rows[-1][1], rows[-1][0])
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        [row[0] for row in rows])
+    results = [
+        (posts[pk], highlight(snippet))
+        for pk, rank, snippet in rows if pk in posts
+    ]
+    return results, next_cursor
+
+
+def filter_by_text(queryset, query):
+    """Фильтр queryset по полнотекстовому индексу (для админки)."""
+    match = match_expression(query)
+    if not match:
+        return queryset
+    if not fts_available():
+        return queryset.filter(text__icontains=query)
+    return queryset.filter(pk__in=RawSQL(
+        'SELECT rowid FROM posts_post_fts WHERE posts_post_fts MATCH %s',
+        [match],
+    ))
+
+
+def prefix_range(field, prefix):
+    """Префикс как диапазон [prefix, следующая строка).
+
+    В отличие от LIKE/istartswith такое условие SQLite отдаёт индексу.
+    """
+    upper = prefix[:-1] + chr(min(ord(prefix[-1]) + 1, 0x10FFFF))
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': upper})
+
+
+def group_prefix_filter(query):
+    """Условие автодополнения групп по началу названия или slug.
+
+    Сравнение в индексе регистрозависимое, поэтому название ищем как
+    ввели и с заглавной буквы, а slug — в нижнем регистре.
+    """
+    condition = prefix_range('slug', query.lower())
+    for title in {query, query[:1].upper() + query[1:]}:
+        condition |= prefix_range('title', title)
+    return condition
@@ -0,0 +1,155 @@
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from . import cache, fanout, stats
+from .models import Group, Post, User
+
+
+def invalidate_post_pages(author_ids=(), group_ids=()):
+    """Сбрасываем страничный кэш главной, профилей и групп."""
+    scopes = [cache.index_scope()]
+    author_ids = {pk for pk in author_ids if pk is not None}
+    group_ids = {pk for pk in group_ids if pk is not None}
+    if author_ids:
+        scopes += [
+            cache.profile_scope(username) for username in
+            User.objects.filter(pk__in=author_ids).values_list(
+                'username', flat=True)
+        ]
+    if group_ids:
+        scopes += [
+            cache.group_scope(slug) for slug in
+            Group.objects.filter(pk__in=group_ids).values_list(
+                'slug', flat=True)
+        ]
+    cache.invalidate_pages(*scopes)
+
+
+def invalidate_directory(*group_ids):
+    """Каталог групп зависит только от счётчиков и самих групп."""
+    if any(pk is not None for pk in group_ids):
+        cache.invalidate_pages(cache.directory_scope())
+
+
+def remember_relations(instance):
+    # Берём из __dict__, чтобы не дёргать отложенные поля лишним запросом.
+    instance._initial_author_id = instance.__dict__.get('author_id')
+    instance._initial_group_id = instance.__dict__.get('group_id')
+
+
+@receiver(post_init, sender=Post)
+def post_loaded(sender, instance, **kwargs):
+    remember_relations(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    cache.bump_version(cache.post_version_key(instance.pk))
+    old_author_id = instance._initial_author_id
+    old_group_id = instance._initial_group_id
+    if created:
+        stats.author_post_added(instance)
+        stats.change_site_count(1)
+        fanout.fan_out_post(instance)
+    elif old_author_id != instance.author_id:
+        stats.author_post_removed(instance, old_author_id, old_group_id)
+        stats.author_post_added(instance)
+        fanout.refan_post(instance)
+    elif old_group_id != instance.group_id:
+        stats.refresh_group_count(instance.author_id)
+    if created:
+        stats.group_post_added(instance)
+        invalidate_directory(instance.group_id)
+    elif old_group_id != instance.group_id:
+        stats.group_post_removed(instance, old_group_id)
+        stats.group_post_added(instance)
+        invalidate_directory(old_group_id, instance.group_id)
+    invalidate_post_pages(
+        (old_author_id, instance.author_id),
+        (old_group_id, instance.group_id),
+    )
+    remember_relations(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    stats.author_post_removed(
+        instance, instance.author_id, instance.group_id)
+    stats.group_post_removed(instance, instance.group_id)
+    stats.change_site_count(-1)
+    invalidate_directory(instance.group_id)
+    invalidate_post_pages((instance.author_id,), (instance.group_id,))
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleting(sender, instance, **kwargs):
+    # Посты останутся без группы (SET_NULL) в обход сигналов Post,
+    # поэтому запоминаем затронутых авторов заранее.
+    instance._post_author_ids = list(
+        instance.posts.order_by().values_list(
+            'author_id', flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    author_ids = getattr(instance, '_post_author_ids', ())
+    for author_id in author_ids:
+        stats.refresh_group_count(author_id)
+    cache.invalidate_pages(
+        cache.group_scope(instance.slug), cache.directory_scope())
+    invalidate_post_pages(author_ids)
+
+
+@receiver(post_init, sender=Group)
+def group_loaded(sender, instance, **kwargs):
+    instance._initial_slug = instance.__dict__.get('slug')
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, **kwargs):
+    cache.bump_version(cache.group_version_key(instance.pk))
+    cache.invalidate_pages(
+        cache.group_scope(instance._initial_slug),
+        cache.group_scope(instance.slug),
+        cache.directory_scope(),
+    )
+    if instance._initial_slug not in (None, instance.slug):
+        # Ссылки на группу есть в карточках главной и профилей.
+        invalidate_post_pages(
+            instance.posts.order_by().values_list(
+                'author_id', flat=True).distinct()
+        )
+    instance._initial_slug = instance.slug
+
+
+@receiver(post_init, sender=User)
+def author_loaded(sender, instance, **kwargs):
+    instance._initial_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        # Вход на сайт не меняет ничего из того, что видно в карточке.
+        return
+    cache.bump_version(cache.author_version_key(instance.pk))
+    cache.invalidate_pages(
+        cache.profile_scope(instance._initial_username),
+        cache.profile_scope(instance.username),
+    )
+    if not created:
+        invalidate_post_pages(
+            (instance.pk,),
+            instance.posts.order_by().values_list(
+                'group_id', flat=True).distinct(),
+        )
+    instance._initial_username = instance.username
+
+
+@receiver(post_delete, sender=User)
+def author_deleted(sender, instance, **kwargs):
+    cache.invalidate_pages(cache.profile_scope(instance.username))
@@ -0,0 +1,158 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import AuthorStats, GroupStats, Post, SiteStats
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def author_aggregates(posts):
+    """Одна агрегирующая выборка: число постов, последняя дата, группы."""
+    return posts.order_by().values('author_id').annotate(
+        post_count=Count('id'),
+        last_post_date=Max('pub_date'),
+        group_count=Count('group', distinct=True),
+    )
+
+
+def refresh_author_stats(author_id):
+    """Пересчитываем строку статистики одного автора целиком."""
+    rows = list(author_aggregates(Post.objects.filter(author_id=author_id)))
+    defaults = {'post_count': 0, 'last_post_date': None, 'group_count': 0}
+    if rows:
+        row = rows[0]
+        defaults = {field: row[field] for field in defaults}
+    AuthorStats.objects.update_or_create(
+        author_id=author_id, defaults=defaults)
+
+
+def refresh_group_count(author_id):
+    group_count = Post.objects.filter(
+        author_id=author_id, group__isnull=False
+    ).values('group').distinct().count()
+    AuthorStats.objects.filter(author_id=author_id).update(
+        group_count=group_count)
+
+
+def author_post_added(post):
+    updated = AuthorStats.objects.filter(author_id=post.author_id).update(
+        post_count=F('post_count') + 1,
+        last_post_date=Greatest(
+            Coalesce('last_post_date', post.pub_date), post.pub_date),
+    )
+    if not updated:
+        # Строки ещё нет (например, до первой пересборки) —
+        # считаем её с нуля, заодно с группами.
+        refresh_author_stats(post.author_id)
+    elif post.group_id is not None:
+        refresh_group_count(post.author_id)
+
+
+def author_post_removed(post, author_id, group_id):
+    AuthorStats.objects.filter(author_id=author_id).update(
+        post_count=F('post_count') - 1)
+    stats = AuthorStats.objects.filter(author_id=author_id).first()
+    if stats is None:
+        return
+    if stats.last_post_date is None or post.pub_date >= stats.last_post_date:
+        last_post = Post.objects.filter(author_id=author_id).exclude(
+            pk=post.pk).aggregate(last=Max('pub_date'))
+        stats.last_post_date = last_post['last']
+        stats.save(update_fields=['last_post_date'])
+    if group_id is not None:
+        refresh_group_count(author_id)
+
+
+def refresh_group_stats(group_id):
+    row = Post.objects.filter(group_id=group_id).aggregate(
+        post_count=Count('id'), last_post_date=Max('pub_date'))
+    GroupStats.objects.update_or_create(group_id=group_id, defaults=row)
+
+
+def group_post_added(post):
+    if post.group_id is None:
+        return
+    updated = GroupStats.objects.filter(group_id=post.group_id).update(
+        post_count=F('post_count') + 1,
+        last_post_date=Greatest(
+            Coalesce('last_post_date', post.pub_date), post.pub_date),
+    )
+    if not updated:
+        refresh_group_stats(post.group_id)
+
+
+def group_post_removed(post, group_id):
+    if group_id is None:
+        return
+    GroupStats.objects.filter(group_id=group_id).update(
+        post_count=F('post_count') - 1)
+    stats = GroupStats.objects.filter(group_id=group_id).first()
+    if stats is None:
+        return
+    if stats.last_post_date is None or post.pub_date >= stats.last_post_date:
+        last_post = Post.objects.filter(group_id=group_id).exclude(
+            pk=post.pk).aggregate(last=Max('pub_date'))
+        stats.last_post_date = last_post['last']
+        stats.save(update_fields=['last_post_date'])
+
+
+def refresh_site_stats():
+    SiteStats.objects.update_or_create(
+        pk=SiteStats.SINGLETON_ID,
+        defaults={'post_count': Post.objects.count()},
+    )
+
+
+def change_site_count(delta):
+    updated = SiteStats.objects.filter(pk=SiteStats.SINGLETON_ID).update(
+        post_count=F('post_count') + delta)
+    if not updated:
+        refresh_site_stats()
+
+
+def related_post_count(instance):
+    """Счётчик постов из подгруженной строки stats автора или группы."""
+    try:
+        return instance.stats.post_count
+    except ObjectDoesNotExist:
+        return None
+
+
+def site_post_count():
+    return SiteStats.objects.filter(
+        pk=SiteStats.SINGLETON_ID).values_list('post_count', flat=True).first()
+
+
+def rebuild_counters():
+    """Пересобираем счётчики групп и общий счётчик постов."""
+    rows = Post.objects.filter(group__isnull=False).order_by().values(
+        'group_id').annotate(
+        post_count=Count('id'), last_post_date=Max('pub_date'))
+    with transaction.atomic():
+        GroupStats.objects.all().delete()
+        # Размер INSERT выбирает Django: явный batch_size в 2.2 обходит
+        # предел SQLite в 500 строк на запрос.
+        GroupStats.objects.bulk_create(
+            GroupStats(**row) for row in rows.iterator())
+        refresh_site_stats()
+    return GroupStats.objects.count()
+
+
+def rebuild_author_stats(batch_size=REBUILD_BATCH_SIZE):
+    """Пересобираем всю таблицу одной агрегацией и bulk_create."""
+    rows = author_aggregates(Post.objects.all())
+    with transaction.atomic():
+        AuthorStats.objects.all().delete()
+        batch = []
+        total = 0
+        for row in rows.iterator():
+            batch.append(AuthorStats(**row))
+            if len(batch) >= batch_size:
+                AuthorStats.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        AuthorStats.objects.bulk_create(batch)
+        total += len(batch)
+    return total
@@ -0,0 +1,15 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..cache import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts, show_group=True):
+    """Карточки постов страницы из версионированного кэша фрагментов.
+
+    Использование: {% post_cards page_obj as cards %}
+    """
+    return [mark_safe(card) for card in render_post_cards(posts, show_group)]
@@ -0,0 +1,21 @@
+from django import template
+
+from ..thumbnails import thumbnail_sizes
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, sizes='100vw'):
+    """Картинка поста с srcset из готовых миниатюр.
+
+    Миниатюры здесь никогда не генерируются: пока их нет, выводится
+    оригинал с известными размерами.
+    """
+    thumbnails = thumbnail_sizes(post)
+    return {
+        'post': post,
+        'sizes': sizes,
+        'thumbnails': thumbnails,
+        'fallback': thumbnails[-1] if thumbnails else None,
+    }
@@ -0,0 +1,112 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..forms import PostForm
+from ..models import Group, Post
+from ..search import group_prefix_filter
+from .test_query_plan import query_plan
+
+User = get_user_model()
+
+
+class GroupAutocompleteTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.groups = [
+            Group.objects.create(
+                title=f'Группа {i:02}',
+                slug=f'group-{i:02}',
+                description='Тестовый текст',
+            )
+            for i in range(30)
+        ]
+        cls.other = Group.objects.create(
+            title='Котики', slug='cats', description='Тестовый текст')
+
+    def setUp(self):
+        # Бакет записей пользователя живёт в кэше между тестами.
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.url = reverse('posts:group_autocomplete')
+
+    def results(self, query):
+        response = self.authorized_client.get(self.url, {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_prefix_search(self):
+        """Группы ищутся по началу названия и slug, без учёта регистра."""
+        for query in ('Кот', 'кот', 'cat', 'CA'):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.results(query),
+                    [{'id': self.other.pk, 'title': 'Котики',
+                      'slug': 'cats'}])
+        self.assertEqual(self.results('отик'), [])
+        self.assertEqual(self.results(''), [])
+
+    @override_settings(GROUP_AUTOCOMPLETE_LIMIT=5)
+    def test_results_are_limited(self):
+        """Ответ ограничен настройкой и отсортирован по названию."""
+        titles = [group['title'] for group in self.results('Группа 1')]
+        self.assertEqual(titles, [f'Группа {i}' for i in range(10, 15)])
+
+    def test_create_page_renders_only_selected_group(self):
+        """Форма не выводит список всех групп."""
+        response = self.authorized_client.get(reverse('posts:post_create'))
+        self.assertNotContains(response, self.other.title)
+        self.assertContains(response, 'data-autocomplete-url')
+        self.assertContains(response, 'js/group_autocomplete.js')
+        post = Post.objects.create(
+            author=self.user, text='Тестовый текст', group=self.other)
+        response = self.authorized_client.get(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}))
+        self.assertContains(response, self.other.title)
+        self.assertNotContains(response, self.groups[0].title)
+
+    def test_garbage_group_rerenders_form(self):
+        """Нечисловая или несуществующая группа — ошибка формы, не 500."""
+        for value in ('abc', str(10 ** 6)):
+            with self.subTest(group=value):
+                response = self.authorized_client.post(
+                    reverse('posts:post_create'),
+                    {'text': 'Текст', 'group': value})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['form'].errors['group'])
+        self.assertFalse(Post.objects.exists())
+
+    def test_form_validates_submitted_group_only(self):
+        """Проверка группы читает только присланный id."""
+        form = PostForm(data={'text': 'Текст', 'group': self.other.pk})
+        # Поле и валидация ForeignKey модели: оба запроса по id.
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(form.is_valid())
+        self.assertEqual(len(queries), 2)
+        for query in queries:
+            self.assertIn(f'"id" = {self.other.pk}', query['sql'])
+        self.assertEqual(form.cleaned_data['group'], self.other)
+        form = PostForm(data={'text': 'Текст', 'group': 10 ** 6})
+        self.assertFalse(form.is_valid())
+        self.assertIn('group', form.errors)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Планы SQLite')
+class GroupAutocompletePlanTest(TestCase):
+    def test_prefix_lookup_uses_indexes(self):
+        """Поиск по префиксу идёт по индексам title и slug."""
+        plan = query_plan(
+            Group.objects.filter(group_prefix_filter('кот')).values('id'))
+        for step in plan:
+            if step.startswith('SCAN'):
+                self.assertIn('USING', step, plan)
+        self.assertTrue(any('title' in step for step in plan), plan)
+        self.assertTrue(any('slug' in step for step in plan), plan)
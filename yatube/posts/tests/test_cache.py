@@ -0,0 +1,194 @@
+import warnings
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..cache import CARD_TEMPLATE, render_post_cards
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='HasNoName', first_name='Имя', last_name='Фамилия')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='cards',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=self.user, text='Тестовый текст', group=self.group)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def cards(self):
+        return render_post_cards(
+            Post.objects.select_related('author', 'group'))
+
+    def test_cards_are_rendered_once(self):
+        """Повторный рендер берёт карточки из кэша."""
+        self.cards()
+        with self.assertTemplateNotUsed(CARD_TEMPLATE):
+            cards = self.cards()
+        self.assertIn('Тестовый текст', cards[0])
+
+    def test_post_edit_bumps_version(self):
+        """Правка поста через post_edit сбрасывает его карточку."""
+        self.cards()
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Новый текст', 'group': self.group.pk},
+        )
+        self.assertIn('Новый текст', self.cards()[0])
+
+    def test_author_and_group_changes_bump_version(self):
+        """Смена имени автора и slug группы видны в карточке сразу."""
+        self.cards()
+        self.user.first_name = 'Другое'
+        self.user.save()
+        self.assertIn('Другое Фамилия', self.cards()[0])
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'cards-renamed'
+        group.save()
+        self.assertIn('/group/cards-renamed/', self.cards()[0])
+
+    def test_login_keeps_cards(self):
+        """Вход автора не сбрасывает его карточки."""
+        self.cards()
+        self.user.last_login = self.post.pub_date
+        self.user.save(update_fields=['last_login'])
+        with self.assertTemplateNotUsed(CARD_TEMPLATE):
+            self.cards()
+
+
+class AnonymousPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='pages',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='pages-other',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый текст', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:posts_group',
+                             kwargs={'slug': self.group.slug}),
+            'other_group': reverse('posts:posts_group',
+                                   kwargs={'slug': self.other_group.slug}),
+            'profile': reverse('posts:profile',
+                               kwargs={'username': self.user.username}),
+        }
+
+    def assertCached(self, url, cached=True):
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        if cached:
+            self.assertIsNone(response.context, url)
+        else:
+            self.assertIsNotNone(response.context, url)
+        return response
+
+    def test_anonymous_pages_are_cached(self):
+        """Повторный анонимный запрос отдаётся из кэша."""
+        for url in self.urls.values():
+            with self.subTest(url=url):
+                self.assertCached(url, cached=False)
+                self.assertCached(url)
+        self.assertCached(self.urls['index'] + '?page=2', cached=False)
+
+    def test_authorized_pages_are_not_cached(self):
+        """Авторизованный пользователь всегда получает свежую страницу."""
+        self.authorized_client.get(self.urls['index'])
+        response = self.authorized_client.get(self.urls['index'])
+        self.assertIsNotNone(response.context)
+
+    def test_post_create_invalidates_affected_pages(self):
+        """Новый пост сразу виден на главной, в группе и в профиле."""
+        for url in self.urls.values():
+            self.guest_client.get(url)
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Свежий пост', 'group': self.group.pk},
+        )
+        for name in ('index', 'group', 'profile'):
+            with self.subTest(page=name):
+                response = self.assertCached(self.urls[name], cached=False)
+                self.assertContains(response, 'Свежий пост')
+        self.assertCached(self.urls['other_group'])
+
+    def test_post_edit_invalidates_old_and_new_group(self):
+        """Перенос поста в другую группу обновляет обе группы."""
+        for url in self.urls.values():
+            self.guest_client.get(url)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Перенесённый пост', 'group': self.other_group.pk},
+        )
+        response = self.assertCached(self.urls['group'], cached=False)
+        self.assertNotContains(response, 'Перенесённый пост')
+        response = self.assertCached(self.urls['other_group'], cached=False)
+        self.assertContains(response, 'Перенесённый пост')
+
+    def test_group_change_invalidates_group_page(self):
+        """Правка группы (например, в админке) обновляет её страницу."""
+        self.guest_client.get(self.urls['group'])
+        self.guest_client.get(self.urls['index'])
+        group = Group.objects.get(pk=self.group.pk)
+        group.description = 'Новое описание'
+        group.save()
+        response = self.assertCached(self.urls['group'], cached=False)
+        self.assertContains(response, 'Новое описание')
+        self.assertCached(self.urls['index'])
+
+    def test_ignored_params_share_entry(self):
+        """Мусор в ?page= и ?after= не плодит копии страницы."""
+        index = self.urls['index']
+        self.assertCached(index, cached=False)
+        for query in ('?page=abc', '?page=1', '?after=!!!', '?foo=bar'):
+            with self.subTest(query=query):
+                self.assertCached(index + query)
+
+    def test_out_of_range_pages_are_not_cached(self):
+        """page=0 и слишком глубокие страницы в кэш не попадают."""
+        deep = settings.PAGE_CACHE_MAX_PAGE + 1
+        for query in ('?page=0', '?page=-1', f'?page={deep}'):
+            with self.subTest(query=query):
+                self.assertCached(self.urls['index'] + query, cached=False)
+                self.assertCached(self.urls['index'] + query, cached=False)
+
+    def test_keys_are_safe_for_memcached(self):
+        """Не-ASCII username и длинные параметры не дают CacheKeyWarning."""
+        author = User.objects.create_user(username='Автор')
+        url = reverse('posts:profile', kwargs={'username': author.username})
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.guest_client.get(url, {'after': 'я' * 300})
+            self.assertCached(url)
+        self.assertFalse(
+            [w for w in caught if issubclass(w.category, CacheKeyWarning)])
@@ -0,0 +1,118 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='conditional',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый текст', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.urls = (
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            reverse('posts:posts_group', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': self.user.username}),
+        )
+
+    def test_not_modified_without_rendering(self):
+        """Совпавший ETag даёт 304 одним запросом, без шаблона."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                with self.assertNumQueries(1):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertIsNone(response.context)
+
+    def test_if_modified_since_for_anonymous(self):
+        """Аноним получает Last-Modified и 304 по If-Modified-Since."""
+        url = self.urls[0]
+        last_modified = self.guest_client.get(url)['Last-Modified']
+        response = self.guest_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_feeds_validate_by_etag_only(self):
+        """Группа и профиль: без Last-Modified и без агрегатов по постам."""
+        for url in self.urls[1:]:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertFalse(response.has_header('Last-Modified'))
+                with CaptureQueriesContext(connection) as queries:
+                    self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=response['ETag'])
+                sql = queries[0]['sql']
+                self.assertNotIn('GROUP BY', sql)
+                self.assertNotIn('posts_post', sql)
+
+    def test_post_delete_changes_etag(self):
+        """Удаление поста меняет ETag группы и профиля."""
+        other = Post.objects.create(
+            author=self.user, text='Удаляемый', group=self.group)
+        etags = [self.guest_client.get(url)['ETag'] for url in self.urls[1:]]
+        other.delete()
+        for url, etag in zip(self.urls[1:], etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, 'Удаляемый')
+
+    def test_edit_changes_validators(self):
+        """После правки поста старый ETag больше не подходит."""
+        etags = [self.guest_client.get(url)['ETag'] for url in self.urls]
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Новый текст', 'group': self.group.pk},
+        )
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Новый текст')
+
+    def test_author_rename_changes_etag(self):
+        """Смена имени автора меняет ETag группы и профиля."""
+        urls = self.urls[1:]
+        etags = [self.guest_client.get(url)['ETag'] for url in urls]
+        author = User.objects.get(pk=self.user.pk)
+        author.first_name = 'Переименованный'
+        author.save()
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Переименованный')
+
+    def test_etag_depends_on_user(self):
+        """Аноним и автор видят разные страницы и разные ETag."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                anonymous = self.guest_client.get(url)
+                authorized = self.authorized_client.get(url)
+                self.assertNotEqual(anonymous['ETag'], authorized['ETag'])
+                self.assertFalse(authorized.has_header('Last-Modified'))
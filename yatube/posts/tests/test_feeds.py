@@ -0,0 +1,94 @@
+import warnings
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='feeds',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый текст', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.urls = (
+            reverse('posts:index_feed'),
+            reverse('posts:index_atom'),
+            reverse('posts:group_feed', kwargs={'slug': self.group.slug}),
+            reverse('posts:group_atom', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile_feed',
+                    kwargs={'username': self.user.username}),
+            reverse('posts:profile_atom',
+                    kwargs={'username': self.user.username}),
+        )
+
+    def test_feeds_list_posts(self):
+        """Ленты отдают посты своей области."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Тестовый текст')
+
+    def test_polling_costs_no_queries(self):
+        """Повторный опрос отдаётся из кэша без запросов к базе."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    cached = self.guest_client.get(url)
+                self.assertEqual(cached.content, response.content)
+                with self.assertNumQueries(0):
+                    not_modified = self.guest_client.get(
+                        url,
+                        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                self.assertEqual(not_modified.status_code, 304)
+
+    def test_post_edit_refreshes_feeds(self):
+        """Правка поста сразу видна во всех его лентах."""
+        etags = [self.guest_client.get(url)['ETag'] for url in self.urls]
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Обновлённый текст', 'group': self.group.pk},
+        )
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Обновлённый текст')
+
+    def test_unknown_group_feed(self):
+        """Лента несуществующей группы — 404, и она не кэшируется."""
+        url = reverse('posts:group_feed', kwargs={'slug': 'missing'})
+        self.assertEqual(self.guest_client.get(url).status_code, 404)
+
+    def test_feed_keys_are_safe_for_memcached(self):
+        """Не-ASCII username в адресе ленты не даёт CacheKeyWarning."""
+        author = User.objects.create_user(username='Автор' * 30)
+        Post.objects.create(author=author, text='Пост автора')
+        url = reverse('posts:profile_feed', kwargs={'username': author})
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertContains(self.guest_client.get(url), 'Пост автора')
+            self.assertContains(self.guest_client.get(url), 'Пост автора')
+        self.assertFalse(
+            [w for w in caught if issubclass(w.category, CacheKeyWarning)])
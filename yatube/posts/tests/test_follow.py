@@ -0,0 +1,155 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from yatube.settings import QUANTITY
+
+from ..fanout import fan_out_in_batches
+from ..models import FeedItem, Follow, Post
+from ..paginator import CursorPaginator
+from .test_query_plan import query_plan
+
+User = get_user_model()
+
+
+class FollowTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.reader = User.objects.create_user(username='Reader')
+        cls.stranger = User.objects.create_user(username='Stranger')
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def follow(self, username='Author'):
+        return self.reader_client.post(
+            reverse('posts:profile_follow', kwargs={'username': username}))
+
+    def feed(self):
+        response = self.reader_client.get(reverse('posts:follow_index'))
+        return response.context['posts']
+
+    def test_follow_and_unfollow(self):
+        """Подписка и отписка работают только через POST."""
+        response = self.follow()
+        self.assertRedirects(
+            response, reverse('posts:profile', kwargs={'username': 'Author'}))
+        self.assertTrue(Follow.objects.filter(
+            user=self.reader, author=self.author).exists())
+        self.follow()
+        self.assertEqual(Follow.objects.count(), 1)
+        self.reader_client.post(reverse(
+            'posts:profile_unfollow', kwargs={'username': 'Author'}))
+        self.assertFalse(Follow.objects.exists())
+        response = self.reader_client.get(
+            reverse('posts:profile_follow', kwargs={'username': 'Author'}))
+        self.assertEqual(response.status_code, 405)
+
+    def test_cannot_follow_self(self):
+        """На себя подписаться нельзя."""
+        self.follow('Reader')
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_reaches_followers_only(self):
+        """Новый пост попадает в ленты подписчиков, и только в них."""
+        self.follow()
+        post = Post.objects.create(author=self.author, text='Для подписчиков')
+        self.assertEqual(self.feed(), [post])
+        stranger_client = Client()
+        stranger_client.force_login(self.stranger)
+        response = stranger_client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['posts'], [])
+
+    def test_follow_backfills_and_unfollow_clears(self):
+        """Подписка догружает старые посты, отписка убирает их."""
+        posts = [Post.objects.create(author=self.author, text=f'Пост {i}')
+                 for i in range(QUANTITY + 2)]
+        self.follow()
+        self.assertEqual(self.feed(), posts[::-1][:QUANTITY])
+        self.reader_client.post(reverse(
+            'posts:profile_unfollow', kwargs={'username': 'Author'}))
+        self.assertFalse(FeedItem.objects.filter(user=self.reader).exists())
+
+    def test_profile_shows_follow_state(self):
+        """Профиль показывает кнопку в зависимости от подписки."""
+        url = reverse('posts:profile', kwargs={'username': 'Author'})
+        self.assertFalse(self.reader_client.get(url).context['following'])
+        self.follow()
+        self.assertTrue(self.reader_client.get(url).context['following'])
+
+    def test_follow_changes_profile_etag(self):
+        """После подписки старый ETag профиля не даёт 304."""
+        url = reverse('posts:profile', kwargs={'username': 'Author'})
+        etag = self.reader_client.get(url)['ETag']
+        self.follow()
+        response = self.reader_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['following'])
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(FANOUT_INLINE_LIMIT=1, FANOUT_BATCH_SIZE=2)
+    def test_large_audience_is_fanned_out_in_batches(self):
+        """Большую аудиторию раскладывает фоновая задача пачками."""
+        readers = [User.objects.create_user(username=f'reader{i}')
+                   for i in range(5)]
+        Follow.objects.bulk_create(
+            Follow(user=reader, author=self.author) for reader in readers)
+        post = Post.objects.create(author=self.author, text='Популярный')
+        # В запросе ничего не записано: работа ушла в воркер.
+        self.assertFalse(FeedItem.objects.filter(post=post).exists())
+        fan_out_in_batches(post.pk)
+        self.assertEqual(
+            set(FeedItem.objects.filter(post=post).values_list(
+                'user_id', flat=True)),
+            {reader.pk for reader in readers})
+
+    def test_audience_over_sqlite_insert_limit(self):
+        """Больше 500 подписчиков при настройках по умолчанию."""
+        User.objects.bulk_create(
+            User(username=f'fan{i}') for i in range(600))
+        readers = User.objects.filter(username__startswith='fan')
+        Follow.objects.bulk_create(
+            Follow(user=reader, author=self.author) for reader in readers)
+        post = Post.objects.create(author=self.author, text='Популярный')
+        fan_out_in_batches(post.pk)
+        self.assertEqual(FeedItem.objects.filter(post=post).count(), 600)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', 'Планы SQLite')
+    def test_feed_is_index_range_scan(self):
+        """Страница подписок — поиск по индексу без сортировки."""
+        items = FeedItem.objects.filter(user=self.reader).select_related(
+            'post__author', 'post__group')
+        paginator = CursorPaginator(items, QUANTITY)
+        key = (timezone.now(), 1)
+        for queryset in (paginator.forward_queryset(),
+                         paginator.forward_queryset(key),
+                         paginator.backward_queryset(key)):
+            plan = query_plan(queryset)
+            self.assertTrue(
+                any('feed_user_pub_date_idx' in step for step in plan), plan)
+            for step in plan:
+                self.assertNotIn('TEMP B-TREE', step, plan)
+
+    def test_feed_pages_without_count(self):
+        """Лента листается курсором и не считает COUNT(*)."""
+        self.follow()
+        posts = [Post.objects.create(author=self.author, text=f'Пост {i}')
+                 for i in range(QUANTITY + 2)]
+        url = reverse('posts:follow_index')
+        with CaptureQueriesContext(connection) as queries:
+            first = self.reader_client.get(url).context['page_obj']
+        self.assertFalse(
+            [q for q in queries if 'COUNT(' in q['sql']], queries)
+        self.assertTrue(first.has_next())
+        second = self.reader_client.get(
+            url, {'after': first.next_cursor}).context
+        self.assertEqual(second['posts'], posts[::-1][QUANTITY:])
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class GroupDirectoryTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.quiet = Group.objects.create(
+            title='Альфа', slug='alpha', description='Тихая группа')
+        cls.busy = Group.objects.create(
+            title='Бета', slug='beta', description='Шумная группа')
+        cls.empty = Group.objects.create(
+            title='Гамма', slug='gamma', description='Пустая группа')
+        Post.objects.create(author=cls.user, text='Старый', group=cls.quiet)
+        for i in range(3):
+            Post.objects.create(author=cls.user, text=f'{i}', group=cls.busy)
+        Post.objects.create(author=cls.user, text='Новый', group=cls.quiet)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.url = reverse('posts:group_index')
+
+    def titles(self, sort=None):
+        params = {'sort': sort} if sort else {}
+        response = self.guest_client.get(self.url, params)
+        return [group.title for group in response.context['groups']]
+
+    def test_sorting(self):
+        """Каталог сортируется по активности, числу постов и названию."""
+        self.assertEqual(self.titles(), ['Альфа', 'Бета', 'Гамма'])
+        self.assertEqual(self.titles('posts'), ['Бета', 'Альфа', 'Гамма'])
+        self.assertEqual(self.titles('title'), ['Альфа', 'Бета', 'Гамма'])
+        self.assertEqual(self.titles('activity'), ['Альфа', 'Бета', 'Гамма'])
+        # Неизвестная сортировка — та же страница по умолчанию из кэша.
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(self.url, {'sort': 'bogus'})
+        self.assertEqual(
+            response.content, self.guest_client.get(self.url).content)
+
+    def test_counts_come_from_counters(self):
+        """Числа постов берутся из GroupStats одним запросом."""
+        with self.assertNumQueries(1):
+            response = self.guest_client.get(self.url)
+        self.assertContains(response, '<td>3</td>', html=True)
+        self.assertContains(response, '<td>0</td>', html=True)
+
+    def test_cached_until_counter_changes(self):
+        """Правка текста не сбрасывает кэш, новый пост сбрасывает."""
+        self.guest_client.get(self.url)
+        post = Post.objects.filter(group=self.busy).first()
+        post.text = 'Другой текст'
+        post.save()
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.url)
+        Post.objects.create(author=self.user, text='Ещё', group=self.empty)
+        self.assertEqual(self.titles(), ['Гамма', 'Альфа', 'Бета'])
+        Group.objects.get(pk=self.empty.pk).delete()
+        self.assertEqual(self.titles(), ['Альфа', 'Бета'])
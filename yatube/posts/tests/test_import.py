@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..importer import DEFAULT_BATCH_SIZE
+from ..models import AuthorStats, Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class ImportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='archive',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(content)
+        return path
+
+    def run_import(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_posts', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_jsonl_keeps_dates_and_counters(self):
+        """JSONL импортируется пачками с датами архива и счётчиками."""
+        rows = [
+            {'text': f'Пост {i}', 'author': 'HasNoName', 'group': 'archive',
+             'pub_date': f'2020-01-0{i + 1}T10:00:00+00:00'}
+            for i in range(5)
+        ]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        stdout, stderr = self.run_import(path, '--batch-size', '2')
+        self.assertIn('Импортировано 5', stdout)
+        self.assertIn('строк/с', stderr)
+        oldest = Post.objects.get(text='Пост 0')
+        self.assertEqual(oldest.pub_date.year, 2020)
+        self.assertEqual(oldest.updated_at, oldest.pub_date)
+        self.assertEqual(AuthorStats.objects.get(author=self.user).post_count,
+                         5)
+        self.assertEqual(GroupStats.objects.get(group=self.group).post_count,
+                         5)
+
+    def test_import_csv_skips_bad_rows_and_creates_authors(self):
+        """CSV: плохие строки пропускаются, новые авторы создаются."""
+        path = self.write(
+            'posts.csv',
+            'text,author,group\n'
+            'Первый,newcomer,\n'
+            'Второй,HasNoName,missing\n'
+            ',HasNoName,\n'
+        )
+        stdout, stderr = self.run_import(path, '--create-authors')
+        self.assertIn('Импортировано 1', stdout)
+        self.assertIn('неизвестная группа', stderr)
+        self.assertTrue(
+            Post.objects.filter(author__username='newcomer').exists())
+
+    def test_malformed_jsonl_rows_are_skipped(self):
+        """Битый JSON, не-объекты и несуществующие даты не рвут импорт."""
+        path = self.write('posts.jsonl', '\n'.join([
+            '{"text": "Обрыв',
+            '[1, 2]',
+            json.dumps({'text': 'Дата', 'author': 'HasNoName',
+                        'pub_date': '2020-02-30T10:00:00'}),
+            json.dumps({'text': 'Автор', 'author': ['HasNoName']}),
+            json.dumps({'text': 'Целый', 'author': 'HasNoName'}),
+        ]))
+        checkpoint = os.path.join(self.tmp.name, 'import.checkpoint')
+        stdout, stderr = self.run_import(
+            path, '--batch-size', '2', '--checkpoint', checkpoint)
+        self.assertIn('Импортировано 1 постов, пропущено 4', stdout)
+        self.assertIn('не JSON', stderr)
+        self.assertIn('не объект JSON', stderr)
+        self.assertIn('плохая дата', stderr)
+        self.assertIn('поле author не строка', stderr)
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Целый'])
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_default_batch_size_fits_sqlite_limits(self):
+        """Пачка по умолчанию (больше 500 строк) вставляется целиком."""
+        rows = [{'text': f'Пост {i}', 'author': 'HasNoName'}
+                for i in range(DEFAULT_BATCH_SIZE + 1)]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        stdout, _ = self.run_import(path)
+        self.assertIn(f'Импортировано {len(rows)}', stdout)
+        self.assertEqual(Post.objects.count(), len(rows))
+
+    def test_resume_from_checkpoint(self):
+        """С файлом контрольной точки уже загруженные строки пропускаются."""
+        rows = [{'text': f'Пост {i}', 'author': 'HasNoName'}
+                for i in range(4)]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        checkpoint = self.write('import.checkpoint', '3')
+        stdout, _ = self.run_import(path, '--checkpoint', checkpoint)
+        self.assertIn('Импортировано 1', stdout)
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Пост 3'])
+        self.assertFalse(os.path.exists(checkpoint))
@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from yatube.settings import QUANTITY
+
+from ..models import Group, Post
+from ..paginator import CountedPaginator, CursorPaginator
+
+User = get_user_model()
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+class CursorPaginationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовый текст',
+            slug='cursor'
+        )
+        for i in range(QUANTITY + 5):
+            Post.objects.create(
+                author=cls.user,
+                text=f'{i}',
+                group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_cursor_page_is_page(self):
+        """page_obj в keyset-режиме остаётся Page с Paginator."""
+        response = self.guest_client.get(reverse('posts:index'))
+        page_obj = response.context.get('page_obj')
+        self.assertIsInstance(page_obj, Page)
+        self.assertIsInstance(page_obj.paginator, Paginator)
+        self.assertEqual(len(page_obj), QUANTITY)
+        self.assertTrue(page_obj.has_next())
+        self.assertFalse(page_obj.has_previous())
+
+    def test_after_and_before_tokens(self):
+        """Токены ?after= и ?before= листают ленту в обе стороны."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:posts_group', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': self.user.username}),
+        )
+        expected = list(Post.objects.order_by('-pub_date', '-pk'))
+        for url in urls:
+            with self.subTest(url=url):
+                first = self.guest_client.get(url).context['page_obj']
+                self.assertEqual(list(first), expected[:QUANTITY])
+                second = self.guest_client.get(
+                    url, {'after': first.next_cursor}).context['page_obj']
+                self.assertEqual(list(second), expected[QUANTITY:])
+                self.assertFalse(second.has_next())
+                self.assertTrue(second.has_previous())
+                back = self.guest_client.get(
+                    url, {'before': second.previous_cursor}
+                ).context['page_obj']
+                self.assertEqual(list(back), expected[:QUANTITY])
+
+    def test_bad_token_returns_first_page(self):
+        """Испорченный токен не ломает страницу."""
+        response = self.guest_client.get(
+            reverse('posts:index'), {'after': '!!!'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_page_cost_does_not_depend_on_depth(self):
+        """Одна выборка на страницу, без COUNT(*)."""
+        paginator = CursorPaginator(Post.objects.all(), QUANTITY)
+        page = paginator.get_page()
+        with self.assertNumQueries(1):
+            list(paginator.get_page(after=page.next_cursor))
+
+
+class CountedPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        for i in range(QUANTITY * 3):
+            Post.objects.create(author=cls.user, text=f'{i}')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_count_comes_from_counter(self):
+        """Paginator берёт count из счётчика и не делает COUNT(*)."""
+        paginator = CountedPaginator(
+            Post.objects.all(), QUANTITY, count=QUANTITY * 3)
+        with self.assertNumQueries(1):
+            page = paginator.get_page(2)
+            self.assertEqual(len(page), QUANTITY)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_page_window(self):
+        """В шаблон уходит только окно номеров вокруг текущей."""
+        paginator = CountedPaginator(
+            Post.objects.all(), 1, count=QUANTITY * 3, window=2)
+        self.assertEqual(list(paginator.get_page(1).page_window), [1, 2, 3])
+        self.assertEqual(
+            list(paginator.get_page(10).page_window), [8, 9, 10, 11, 12])
+        last = paginator.num_pages
+        self.assertEqual(
+            list(paginator.get_page(last).page_window),
+            [last - 2, last - 1, last])
+
+    def test_index_uses_site_counter(self):
+        """Главная считает страницы по общему счётчику постов."""
+        response = self.client.get(reverse('posts:index'))
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.paginator.count, Post.objects.count())
+        self.assertEqual(list(page_obj.page_window), [1, 2, 3])
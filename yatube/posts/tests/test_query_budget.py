@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from yatube.settings import QUANTITY
+
+from ..models import Group, Post
+from ..urls import QUERY_BUDGETS
+
+User = get_user_model()
+
+
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # У каждого поста свой автор и своя группа: так N+1 сразу видно.
+        for i in range(QUANTITY + 2):
+            cls.user = User.objects.create_user(username=f'user{i}')
+            cls.group = Group.objects.create(
+                title=f'Группа {i}',
+                description='Тестовый текст',
+                slug=f'group{i}'
+            )
+            cls.post = Post.objects.create(
+                author=cls.user,
+                text=f'Тестовый текст {i}',
+                group=cls.group
+            )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def budget_urls(self):
+        return {
+            'index': reverse('posts:index'),
+            'posts_group': reverse('posts:posts_group',
+                                   kwargs={'slug': self.group.slug}),
+            'profile': reverse('posts:profile',
+                               kwargs={'username': self.user.username}),
+            'post_detail': reverse('posts:post_detail',
+                                   kwargs={'post_id': self.post.pk}),
+            'post_create': reverse('posts:post_create'),
+            'post_edit': reverse('posts:post_edit',
+                                 kwargs={'post_id': self.post.pk}),
+            'search': reverse('posts:search') + '?q=Тестовый',
+            'follow_index': reverse('posts:follow_index'),
+            'group_index': reverse('posts:group_index'),
+            'group_autocomplete': reverse('posts:group_autocomplete')
+            + '?q=Гру',
+        }
+
+    def test_every_budget_has_url(self):
+        """Бюджет объявлен для каждой страницы posts."""
+        self.assertEqual(set(QUERY_BUDGETS), set(self.budget_urls()))
+
+    def test_pages_fit_query_budget(self):
+        """Страницы укладываются в свой бюджет SQL-запросов."""
+        for name, url in self.budget_urls().items():
+            with self.subTest(url_name=name):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.authorized_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    len(queries), QUERY_BUDGETS[name],
+                    [query['sql'] for query in queries])
+
+    def test_other_author_profile_fits_budget(self):
+        """Чужой профиль с кнопкой подписки тоже укладывается в бюджет."""
+        author = User.objects.exclude(pk=self.user.pk).first()
+        url = reverse('posts:profile', kwargs={'username': author.username})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(queries), QUERY_BUDGETS['profile'],
+            [query['sql'] for query in queries])
+
+    @override_settings(DEBUG=True)
+    def test_middleware_reports_query_count(self):
+        """В режиме DEBUG middleware отдаёт число запросов в заголовке."""
+        response = Client().get(reverse('posts:index'))
+        self.assertIn('X-Query-Count', response)
+        self.assertLessEqual(
+            int(response['X-Query-Count']), QUERY_BUDGETS['index'])
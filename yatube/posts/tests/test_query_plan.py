@@ -0,0 +1,68 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from yatube.settings import QUANTITY
+
+from ..models import Group, Post
+from ..paginator import CursorPaginator
+
+User = get_user_model()
+
+
+def query_plan(queryset):
+    """Возвращаем шаги EXPLAIN QUERY PLAN для queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Планы SQLite')
+class QueryPlanTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовый текст',
+            slug='plan'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый текст',
+            group=cls.group
+        )
+
+    def view_querysets(self):
+        """Выборки, которые строят ленты в posts.views."""
+        key = (self.post.pub_date, self.post.pk)
+        feeds = {
+            'index': Post.objects.select_related('author', 'group'),
+            'posts_group': self.group.posts.select_related('author', 'group'),
+            'profile': self.user.posts.select_related('author', 'group'),
+        }
+        querysets = {}
+        for name, posts in feeds.items():
+            paginator = CursorPaginator(posts, QUANTITY)
+            querysets[f'{name} page'] = posts[QUANTITY:QUANTITY * 2]
+            querysets[f'{name} first'] = paginator.forward_queryset()
+            querysets[f'{name} after'] = paginator.forward_queryset(key)
+            querysets[f'{name} before'] = paginator.backward_queryset(key)
+        return querysets
+
+    def test_no_full_scan_or_temp_sort(self):
+        """Ленты читаются по индексу, без полного скана и сортировки."""
+        for name, queryset in self.view_querysets().items():
+            with self.subTest(queryset=name):
+                plan = query_plan(queryset)
+                for step in plan:
+                    self.assertNotIn('TEMP B-TREE', step, plan)
+                    if step.startswith('SCAN'):
+                        self.assertIn('USING', step, plan)
+                if name.endswith(('after', 'before')):
+                    # Глубина страницы не должна влиять на стоимость.
+                    self.assertTrue(
+                        any('pub_date' in step for step in plan), plan)
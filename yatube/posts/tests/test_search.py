@@ -0,0 +1,74 @@
+import unittest
+
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+from yatube.settings import QUANTITY
+
+from ..models import Post
+from ..search import match_expression, search_posts
+
+User = get_user_model()
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'FTS5 есть в SQLite')
+class SearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.post = Post.objects.create(
+            author=cls.user, text='Котики <b>спят</b> весь день')
+        Post.objects.create(author=cls.user, text='Собаки гуляют')
+        for i in range(QUANTITY + 2):
+            Post.objects.create(author=cls.user, text=f'Кролик номер {i}')
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_match_expression_is_quoted(self):
+        """Операторы FTS5 из ввода пользователя не исполняются."""
+        self.assertEqual(
+            match_expression('кот OR "пёс'), '"кот" "OR" """пёс"*')
+        self.assertEqual(match_expression('   '), '')
+
+    def test_search_view_highlights_and_escapes(self):
+        """Поиск находит пост, подсвечивает слово и экранирует HTML."""
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'котики'})
+        results = response.context['results']
+        self.assertEqual([post for post, _ in results], [self.post])
+        snippet = results[0][1]
+        self.assertIn('<mark>Котики</mark>', snippet)
+        self.assertIn('&lt;b&gt;', snippet)
+
+    def test_index_follows_edits_and_deletes(self):
+        """Триггеры держат индекс в актуальном состоянии."""
+        post = Post.objects.create(author=self.user, text='Черепаха')
+        post.text = 'Ящерица'
+        post.save()
+        self.assertEqual(search_posts('черепаха', QUANTITY)[0], [])
+        self.assertEqual(len(search_posts('ящерица', QUANTITY)[0]), 1)
+        post.delete()
+        self.assertEqual(search_posts('ящерица', QUANTITY)[0], [])
+
+    def test_keyset_pages(self):
+        """Страницы результатов не пересекаются и покрывают всё."""
+        first, cursor = search_posts('кролик', QUANTITY)
+        self.assertEqual(len(first), QUANTITY)
+        second, last_cursor = search_posts('кролик', QUANTITY, after=cursor)
+        self.assertEqual(len(second), 2)
+        self.assertIsNone(last_cursor)
+        found = {post.pk for post, _ in first + second}
+        self.assertEqual(len(found), QUANTITY + 2)
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке идёт через FTS5 и находит по префиксу."""
+        request = RequestFactory().get('/')
+        queryset, use_distinct = site._registry[Post].get_search_results(
+            request, Post.objects.all(), 'собак')
+        self.assertFalse(use_distinct)
+        self.assertIn('posts_post_fts', str(queryset.query))
+        self.assertEqual([post.text for post in queryset], ['Собаки гуляют'])
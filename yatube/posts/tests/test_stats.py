@@ -0,0 +1,145 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import AuthorStats, Group, GroupStats, Post
+from ..stats import site_post_count
+
+User = get_user_model()
+
+
+class AuthorStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.other = User.objects.create_user(username='Other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='stats',
+            description='Тестовое описание',
+        )
+        cls.second_group = Group.objects.create(
+            title='Вторая группа',
+            slug='stats-2',
+            description='Тестовое описание',
+        )
+
+    def stats(self, user=None):
+        return AuthorStats.objects.get(author=user or self.user)
+
+    def test_stats_follow_create_and_delete(self):
+        """Создание и удаление поста обновляют статистику автора."""
+        first = Post.objects.create(
+            author=self.user, text='Первый', group=self.group)
+        last = Post.objects.create(author=self.user, text='Второй')
+        stats = self.stats()
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(stats.last_post_date, last.pub_date)
+        self.assertEqual(stats.group_count, 1)
+        last.delete()
+        stats = self.stats()
+        self.assertEqual(stats.post_count, 1)
+        self.assertEqual(stats.last_post_date, first.pub_date)
+        first.delete()
+        stats = self.stats()
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_post_date)
+        self.assertEqual(stats.group_count, 0)
+
+    def test_stats_follow_group_and_author_change(self):
+        """Смена группы и автора поста пересчитывает обоих авторов."""
+        post = Post.objects.create(
+            author=self.user, text='Текст', group=self.group)
+        post.group = self.second_group
+        post.save()
+        self.assertEqual(self.stats().group_count, 1)
+        post = Post.objects.get(pk=post.pk)
+        post.author = self.other
+        post.save()
+        self.assertEqual(self.stats().post_count, 0)
+        self.assertEqual(self.stats(self.other).post_count, 1)
+        self.assertEqual(self.stats(self.other).group_count, 1)
+
+    def test_group_delete_updates_group_count(self):
+        """Удаление группы (SET_NULL) уменьшает число групп автора."""
+        Post.objects.create(author=self.user, text='Текст', group=self.group)
+        # Удаляем свежую копию, чтобы не испортить объект класса.
+        Group.objects.get(pk=self.group.pk).delete()
+        self.assertEqual(self.stats().group_count, 0)
+        self.assertEqual(self.stats().post_count, 1)
+
+    def test_rebuild_command(self):
+        """rebuild_author_stats восстанавливает таблицу с нуля."""
+        Post.objects.create(author=self.user, text='Раз', group=self.group)
+        Post.objects.create(author=self.user, text='Два')
+        Post.objects.create(author=self.other, text='Три')
+        AuthorStats.objects.all().delete()
+        call_command('rebuild_author_stats', stdout=StringIO())
+        self.assertEqual(self.stats().post_count, 2)
+        self.assertEqual(self.stats().group_count, 1)
+        self.assertEqual(self.stats(self.other).post_count, 1)
+
+
+class CountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='counters',
+            description='Тестовое описание',
+        )
+        cls.second_group = Group.objects.create(
+            title='Вторая группа',
+            slug='counters-2',
+            description='Тестовое описание',
+        )
+
+    def group_count(self, group):
+        return GroupStats.objects.get(group=group).post_count
+
+    def test_counters_follow_posts(self):
+        """Счётчики групп и общий счётчик следуют за постами."""
+        total = site_post_count()
+        post = Post.objects.create(
+            author=self.user, text='Текст', group=self.group)
+        Post.objects.create(author=self.user, text='Без группы')
+        self.assertEqual(site_post_count(), total + 2)
+        self.assertEqual(self.group_count(self.group), 1)
+        post.group = self.second_group
+        post.save()
+        self.assertEqual(self.group_count(self.group), 0)
+        self.assertEqual(self.group_count(self.second_group), 1)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.second_group).last_post_date,
+            post.pub_date)
+        post.delete()
+        self.assertEqual(self.group_count(self.second_group), 0)
+        self.assertEqual(site_post_count(), total + 1)
+
+    def test_rebuild_counters_command(self):
+        """rebuild_counters восстанавливает счётчики с нуля."""
+        Post.objects.create(author=self.user, text='Раз', group=self.group)
+        Post.objects.create(author=self.user, text='Два', group=self.group)
+        GroupStats.objects.all().delete()
+        call_command('rebuild_counters', stdout=StringIO())
+        self.assertEqual(self.group_count(self.group), 2)
+        self.assertEqual(site_post_count(), Post.objects.count())
+
+    def test_rebuild_counters_many_groups(self):
+        """Больше 500 групп пересобираются одной командой."""
+        Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'many-{i}', description='')
+            for i in range(600))
+        groups = Group.objects.filter(slug__startswith='many-')
+        Post.objects.bulk_create(
+            Post(author=self.user, text='Текст', group=group)
+            for group in groups)
+        call_command('rebuild_counters', stdout=StringIO())
+        self.assertEqual(
+            GroupStats.objects.filter(group__in=groups, post_count=1).count(),
+            600)
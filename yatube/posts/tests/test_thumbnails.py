@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from ..models import Post
+from ..thumbnails import generate_thumbnails, thumbnail_sizes
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def uploaded_image(name='picture.jpg', size=(800, 400)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostThumbnailsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def create_post(self):
+        with mock.patch('posts.views.schedule_thumbnails') as schedule:
+            self.authorized_client.post(
+                reverse('posts:post_create'),
+                data={'text': 'С картинкой', 'image': uploaded_image()},
+            )
+        post = Post.objects.get(text='С картинкой')
+        schedule.assert_called_once_with(post)
+        return post
+
+    def test_create_saves_image_and_schedules_thumbnails(self):
+        """post_create сохраняет картинку и ставит миниатюры в очередь."""
+        post = self.create_post()
+        self.assertEqual((post.image_width, post.image_height), (800, 400))
+        self.assertFalse(post.thumbnails_ready)
+        response = self.authorized_client.get(reverse('posts:post_create'))
+        self.assertEqual(len(response.context['form'].fields), 2)
+        self.assertIn('image', response.context['image_form'].fields)
+
+    def test_list_never_generates_thumbnails(self):
+        """До работы воркера лента выводит оригинал, ничего не генерируя."""
+        post = self.create_post()
+        with mock.patch('sorl.thumbnail.base.ThumbnailBackend'
+                        '.get_thumbnail') as get_thumbnail:
+            content = Client().get(reverse('posts:index')).content.decode()
+        get_thumbnail.assert_not_called()
+        self.assertIn(post.image.url, content)
+        self.assertIn('loading="lazy"', content)
+        self.assertIn('width="800" height="400"', content)
+
+    def test_worker_generates_srcset(self):
+        """После воркера лента отдаёт srcset из готовых миниатюр."""
+        post = self.create_post()
+        generate_thumbnails(post.pk, post.image.name)
+        post.refresh_from_db()
+        self.assertTrue(post.thumbnails_ready)
+        sizes = thumbnail_sizes(post)
+        self.assertEqual(
+            [(width, height) for _, width, height in sizes],
+            [(320, 160), (640, 320), (800, 400)])
+        for url, _, _ in sizes:
+            path = os.path.join(
+                TEMP_MEDIA_ROOT, url[len(settings.MEDIA_URL):])
+            self.assertTrue(os.path.exists(path), url)
+        content = Client().get(reverse('posts:index')).content.decode()
+        self.assertIn(f'{sizes[0][0]} 320w, {sizes[1][0]} 640w', content)
+        self.assertIn('width="800" height="400"', content)
+
+    def test_edit_with_new_image_resets_thumbnails(self):
+        """Новая картинка в post_edit снова отправляет пост воркеру."""
+        post = self.create_post()
+        generate_thumbnails(post.pk, post.image.name)
+        with mock.patch('posts.views.schedule_thumbnails') as schedule:
+            self.authorized_client.post(
+                reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+                data={'text': 'С картинкой',
+                      'image': uploaded_image('other.jpg')},
+            )
+        post.refresh_from_db()
+        self.assertFalse(post.thumbnails_ready)
+        schedule.assert_called_once()
@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
 from django import forms
+from django.core.cache import cache
 from django.core.paginator import Page
 from yatube.settings import QUANTITY
 
@@ -31,6 +32,10 @@ class PagesTests(TestCase):
             group=cls.group
         )
 
+    def setUp(self):
+        # Анонимные страницы кэшируются целиком, а тестам нужен context.
+        cache.clear()
+
     # Проверяем используемые шаблоны
     def test_pages_uses_correct_template(self):
         """URL-адрес использует соответствующий шаблон."""
@@ -164,6 +169,9 @@ class PaginationTest(TestCase):
         cls.posts_count = Post.objects.count()
         cls.second_quantity = cls.posts_count - QUANTITY
 
+    def setUp(self):
+        cache.clear()
+
     def test_index_pagina(self):
         """Проверка view index pagina."""
         response = self.client.get(reverse('posts:index'))
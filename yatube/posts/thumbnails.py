@@ -0,0 +1,75 @@
+from django.conf import settings
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+
+from core.background import submit_on_commit
+
+from .models import Post
+
+
+class PostThumbnailBackend(ThumbnailBackend):
+    """Бэкенд sorl, который умеет назвать миниатюру без генерации.
+
+    Имя миниатюры зависит только от имени исходника, геометрии и
+    опций, поэтому шаблону не нужны ни файл, ни kvstore.
+    """
+
+    def thumbnail_options(self, source, options):
+        # Те же опции по умолчанию, что и в ThumbnailBackend.get_thumbnail.
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        return options
+
+    def thumbnail_url(self, file_, geometry_string, **options):
+        source = ImageFile(file_)
+        options = self.thumbnail_options(source, options)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return default.storage.url(name)
+
+
+def thumbnail_sizes(post):
+    """[(url, ширина, высота)] готовых миниатюр поста, от меньшей к большей.
+
+    Пока воркер не закончил, список пуст, и шаблон показывает оригинал.
+    """
+    if not post.thumbnails_ready or not post.image_width:
+        return []
+    sizes = []
+    for width in settings.POST_THUMBNAIL_WIDTHS:
+        # sorl не увеличивает картинку: ширина упирается в оригинал.
+        scaled = min(width, post.image_width)
+        height = round(post.image_height * scaled / post.image_width)
+        url = default.backend.thumbnail_url(post.image, str(width))
+        sizes.append((url, scaled, height))
+        if scaled == post.image_width:
+            break
+    return sizes
+
+
+def generate_thumbnails(post_id, image_name):
+    """Готовим все миниатюры поста и отмечаем его готовым."""
+    post = Post.objects.filter(pk=post_id).first()
+    # Картинку успели заменить: миниатюры сделает следующая задача.
+    if post is None or post.image.name != image_name:
+        return
+    for width in settings.POST_THUMBNAIL_WIDTHS:
+        get_thumbnail(post.image, str(width))
+    post.thumbnails_ready = True
+    # save(), а не update(): сигналы сбросят кэш карточки и страниц.
+    post.save(update_fields=['thumbnails_ready', 'updated_at'])
+
+
+def schedule_thumbnails(post):
+    """После коммита отдаём картинку поста фоновому воркеру."""
+    if not post.image:
+        return
+    submit_on_commit(generate_thumbnails, post.pk, post.image.name)
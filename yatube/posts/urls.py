@@ -1,4 +1,4 @@
-from . import views
+from . import feeds, views
 
 from django.urls import path
 
@@ -8,11 +8,51 @@ urlpatterns = [
     # Главная страница
     path('', views.index, name='index'),
     path('group/<slug:slug>/', views.posts_group, name='posts_group'),
+    # Каталог групп
+    path('groups/', views.group_index, name='group_index'),
+    path('groups/autocomplete/', views.group_autocomplete,
+         name='group_autocomplete'),
     # Профайл пользователя
     path('profile/<str:username>/', views.profile, name='profile'),
+    path('profile/<str:username>/follow/', views.profile_follow,
+         name='profile_follow'),
+    path('profile/<str:username>/unfollow/', views.profile_unfollow,
+         name='profile_unfollow'),
+    # Лента подписок
+    path('follow/', views.follow_index, name='follow_index'),
     # Просмотр записи
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    # Поиск по текстам постов
+    path('search/', views.search, name='search'),
     # Создание поста
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    # RSS и Atom: главная, группа, автор
+    path('feed/', feeds.index_rss, name='index_feed'),
+    path('feed/atom/', feeds.index_atom, name='index_atom'),
+    path('group/<slug:slug>/feed/', feeds.group_rss, name='group_feed'),
+    path('group/<slug:slug>/feed/atom/', feeds.group_atom,
+         name='group_atom'),
+    path('profile/<str:username>/feed/', feeds.profile_rss,
+         name='profile_feed'),
+    path('profile/<str:username>/feed/atom/', feeds.profile_atom,
+         name='profile_atom'),
+    # Выгрузка постов для персонала
+    path('export/posts/', views.export_posts, name='export_posts'),
 ]
+
+# Бюджет SQL-запросов на страницу авторизованного пользователя
+# (сессия, пользователь и валидаторы условного GET входят в счёт).
+# Проверяется core.middleware.query_budget в режиме DEBUG и тестами posts.
+QUERY_BUDGETS = {
+    'index': 4,
+    'posts_group': 5,
+    'profile': 6,
+    'post_detail': 4,
+    'post_create': 2,
+    'post_edit': 4,
+    'search': 4,
+    'follow_index': 3,
+    'group_index': 3,
+    'group_autocomplete': 1,
+}
@@ -1,73 +1,227 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db.models import F
+from django.http import (HttpResponseBadRequest, JsonResponse,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
 from yatube.settings import QUANTITY
 
-from .forms import PostForm
-from .models import Group, Post, User
+from core.admission import admit_writes
 
+from .cache import (anonymous_page_cache, directory_scope, group_scope,
+                    index_scope, profile_scope)
+from .conditional import (conditional_page, group_validators,
+                          post_detail_validators, profile_validators)
+from .exporter import (CONTENT_TYPES, SERIALIZERS, ExportFilterError,
+                       export_rows)
+from .fanout import follow, unfollow
+from .forms import PostForm, PostImageForm
+from .models import FeedItem, Follow, Group, Post, User
+from .paginator import CountedPaginator, CursorPaginator
+from .search import group_prefix_filter, search_posts
+from .stats import related_post_count, site_post_count
+from .thumbnails import schedule_thumbnails
 
-def pagina(request, posts):
-    paginator = Paginator(posts, QUANTITY)
+
+# Сортировки каталога групп: всё берётся из счётчиков GroupStats.
+GROUP_ORDERINGS = {
+    'activity': (F('stats__last_post_date').desc(nulls_last=True),
+                 'title'),
+    'posts': (F('stats__post_count').desc(nulls_last=True), 'title'),
+    'title': ('title',),
+}
+
+
+def pagina(request, posts, count=None):
+    if getattr(settings, 'POSTS_CURSOR_PAGINATION', False):
+        paginator = CursorPaginator(posts, QUANTITY)
+        return paginator.get_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    paginator = CountedPaginator(
+        posts, QUANTITY, count=count, window=settings.POSTS_PAGE_WINDOW)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
 
 
+@anonymous_page_cache(index_scope)
 def index(request):
-    posts = Post.objects.all()
+    posts = Post.objects.select_related('author', 'group')
     context = {
-        'page_obj': pagina(request, posts),
+        'page_obj': pagina(request, posts, site_post_count()),
     }
     return render(request, 'posts/index.html', context)
 
 
+@conditional_page(group_validators)
+@anonymous_page_cache(group_scope)
 def posts_group(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
+    group = get_object_or_404(
+        Group.objects.select_related('stats'), slug=slug)
+    posts = group.posts.select_related('author', 'group')
     context = {
         'group': group,
-        'page_obj': pagina(request, posts),
+        'page_obj': pagina(request, posts, related_post_count(group)),
     }
     return render(request, 'posts/group_list.html', context)
 
 
+@anonymous_page_cache(directory_scope, sorts=GROUP_ORDERINGS)
+def group_index(request):
+    sort = request.GET.get('sort')
+    if sort not in GROUP_ORDERINGS:
+        sort = 'activity'
+    groups = Group.objects.select_related('stats').order_by(
+        *GROUP_ORDERINGS[sort])
+    context = {
+        'groups': groups,
+        'sort': sort,
+    }
+    return render(request, 'posts/groups.html', context)
+
+
+def group_autocomplete(request):
+    query = request.GET.get('q', '').strip()
+    groups = []
+    if query:
+        groups = Group.objects.filter(group_prefix_filter(query)).order_by(
+            'title').values('id', 'title', 'slug')[
+            :settings.GROUP_AUTOCOMPLETE_LIMIT]
+    return JsonResponse({'results': list(groups)})
+
+
+@conditional_page(profile_validators)
+@anonymous_page_cache(profile_scope)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
+    author = get_object_or_404(
+        User.objects.select_related('stats'), username=username)
+    posts = author.posts.select_related('author', 'group')
+    following = (
+        request.user.is_authenticated and request.user != author
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
     context = {
         'author': author,
-        'page_obj': pagina(request, posts),
+        'following': following,
+        'page_obj': pagina(request, posts, related_post_count(author)),
     }
     return render(request, 'posts/profile.html', context)
 
 
+@conditional_page(post_detail_validators)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group'), pk=post_id)
     context = {
         'post': post,
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    results, next_cursor = search_posts(
+        query, QUANTITY, after=request.GET.get('after'))
+    context = {
+        'query': query,
+        'results': results,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'posts/search.html', context)
+
+
 @login_required
+@admit_writes
 def post_create(request):
-    form = PostForm(request.POST or None)
-    context = {'form': form}
-    if form.is_valid():
-        post = form.save(commit=False)
-        post.author = request.user
-        post.save()
+    post = Post(author=request.user)
+    form = PostForm(request.POST or None, instance=post)
+    image_form = PostImageForm(
+        request.POST or None, files=request.FILES or None, instance=post)
+    context = {'form': form, 'image_form': image_form}
+    if form.is_valid() and image_form.is_valid():
+        form.save()
+        schedule_thumbnails(post)
         return redirect('posts:profile', request.user.username)
     return render(request, 'posts/create_post.html', context)
 
 
 @login_required
+@admit_writes
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = PostForm(request.POST or None, instance=post)
-    if post.author == request.user and form.is_valid():
+    image_form = PostImageForm(
+        request.POST or None, files=request.FILES or None, instance=post)
+    if (post.author_id == request.user.id and form.is_valid()
+            and image_form.is_valid()):
+        if image_form.has_changed():
+            post.thumbnails_ready = False
         form.save()
+        if image_form.has_changed():
+            schedule_thumbnails(post)
         return redirect('posts:post_detail', post_id)
     return render(request, 'posts/create_post.html',
-                  {'is_edit': True, 'form': form, })
+                  {'is_edit': True, 'form': form, 'image_form': image_form})
+
+
+@login_required
+def follow_index(request):
+    # Лента подписок — диапазон индекса (user, pub_date) таблицы FeedItem.
+    # Всегда keyset-пагинация: счётчика ленты нет, а COUNT(*) по всем
+    # строкам пользователя на каждый запрос нам не нужен.
+    items = FeedItem.objects.filter(user=request.user).select_related(
+        'post__author', 'post__group')
+    page_obj = CursorPaginator(items, QUANTITY).get_page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    context = {
+        'page_obj': page_obj,
+        'posts': [item.post for item in page_obj],
+    }
+    return render(request, 'posts/follow.html', context)
+
+
+@login_required
+@require_POST
+@admit_writes
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    follow(request.user, author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+@require_POST
+@admit_writes
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    unfollow(request.user, author)
+    return redirect('posts:profile', username)
+
+
+@staff_member_required
+def export_posts(request):
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in SERIALIZERS:
+        return HttpResponseBadRequest('Неизвестный формат выгрузки.')
+    try:
+        rows = export_rows(
+            group=request.GET.get('group'),
+            author=request.GET.get('author'),
+            since=request.GET.get('since'),
+            until=request.GET.get('until'),
+        )
+    except ExportFilterError as error:
+        return HttpResponseBadRequest(str(error))
+    response = StreamingHttpResponse(
+        SERIALIZERS[export_format](rows),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="posts.{export_format}"')
+    return response
@@ -0,0 +1,44 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+
+class GroupAutocomplete(forms.Select):
+    """Select, в котором только выбранная группа.
+
+    Остальные варианты подгружает static/js/group_autocomplete.js из
+    posts:group_autocomplete, поэтому GET формы не читает всю таблицу
+    Group, сколько бы групп ни было.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    class Media:
+        js = ('js/group_autocomplete.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        # Берём из queryset поля только выбранную группу, а не все
+        # варианты. Присланный мусор (group=abc) просто не выводим:
+        # ошибку покажет сама форма.
+        field = self.choices.field
+        choices = [('', field.empty_label)]
+        for pk in value:
+            try:
+                group = field.to_python(pk)
+            except ValidationError:
+                continue
+            if group is not None:
+                choices.append((group.pk, str(group)))
+        groups = []
+        for index, (option_value, label) in enumerate(choices):
+            option = self.create_option(
+                name, option_value, label,
+                str(option_value) in value, index, attrs=attrs)
+            groups.append((None, [option], index))
+        return groups
@@ -0,0 +1,35 @@
+// Автодополнение группы для формы поста: варианты приходят
+// из posts:group_autocomplete по первым буквам названия или slug.
+document.addEventListener('DOMContentLoaded', function () {
+  document.querySelectorAll('select[data-autocomplete-url]').forEach(function (select) {
+    var input = document.createElement('input');
+    input.type = 'search';
+    input.className = 'form-control mb-2';
+    input.placeholder = 'Начните вводить название группы';
+    select.parentNode.insertBefore(input, select);
+    var timer = null;
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var query = input.value.trim();
+        if (!query) {
+          return;
+        }
+        var url = select.dataset.autocompleteUrl + '?q=' + encodeURIComponent(query);
+        fetch(url).then(function (response) {
+          return response.json();
+        }).then(function (data) {
+          var current = select.value;
+          while (select.options.length > 1) {
+            select.remove(1);
+          }
+          data.results.forEach(function (group) {
+            var option = new Option(group.title, group.id);
+            option.selected = String(group.id) === current;
+            select.add(option);
+          });
+        });
+      }, 250);
+    });
+  });
+});
@@ -42,23 +42,30 @@ INSTALLED_APPS = [
     'users',
     'core',
     'about',
+    'api',
+    'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.static.PrecompressedStaticMiddleware',
+    'core.middleware.metrics.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.query_budget.QueryBudgetMiddleware',
+    'core.middleware.replicas.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backend.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -73,6 +80,18 @@ TEMPLATES = [
     },
 ]
 
+# В бою шаблоны разбираются один раз и живут в памяти процесса
+if not DEBUG:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+# Разбирать все шаблоны при старте WSGI-процесса (см. yatube/wsgi.py)
+PRECOMPILE_TEMPLATES = not DEBUG
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
@@ -83,8 +102,73 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Постоянные соединения вместо нового на каждый запрос
+        'CONN_MAX_AGE': 600,
+    },
+    # Реплика только для чтения. Локально её заполняет
+    # manage.py sync_replica из основной базы.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+        'CONN_MAX_AGE': 600,
+    },
+}
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Реплики для чтения; пустой список — всё читается из default
+DATABASE_REPLICAS = []
+# Страницы, которые читают с реплик
+REPLICA_VIEWS = {
+    'posts:index',
+    'posts:posts_group',
+    'posts:profile',
+    'posts:post_detail',
+}
+# Модели, которые эти страницы читают с реплик (сессия и пользователь —
+# всегда из default)
+REPLICA_MODELS = {
+    'posts.post',
+    'posts.group',
+    'posts.groupstats',
+    'posts.authorstats',
+    'posts.sitestats',
+}
+# После записи пользователь столько секунд читает основную базу
+REPLICA_PIN_COOKIE = 'pin_primary'
+REPLICA_PIN_SECONDS = 10
+
+# PRAGMA для каждого нового соединения SQLite (см. core.db).
+# WAL не блокирует читателей во время записи, busy_timeout даёт
+# писателям подождать вместо "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+# Сколько живёт отрендеренная карточка поста; актуальность
+# обеспечивают версии в ключе, а не срок жизни.
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+# Страницы лент для анонимов сбрасываются сигналами сразу после записи;
+# срок жизни только ограничивает объём кэша.
+PAGE_CACHE_TIMEOUT = 60 * 10
+# Страницы ленты глубже этой не кэшируются
+PAGE_CACHE_MAX_PAGE = 50
+# Готовые RSS/Atom тоже сбрасываются сигналами при записи
+FEED_CACHE_TIMEOUT = 60 * 60
+FEED_ITEMS = 20
 
 
 # Password validation
@@ -125,12 +209,63 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "static"), ]
-
-# подключаем движок filebased.EmailBackend
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Сюда collectstatic собирает статику для раздачи в бою
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+# В бою имена файлов получают хэш, а текстовые файлы — .gz/.br копии
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'core.storage.CompressedManifestStaticFilesStorage')
+
+# Письма из запросов попадают в очередь, отправляет их drain_outbox
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+# подключаем движок filebased.EmailBackend для фактической отправки
+OUTBOX_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Писем в пачке и темп отправки (писем в секунду)
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_RATE_PER_SECOND = 5
+# Повторы: пауза 30 с, 60 с, 120 с...; после OUTBOX_MAX_ATTEMPTS письмо
+# остаётся в таблице с последней ошибкой
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_MAX_ATTEMPTS = 5
+# Сколько секунд взятое воркером письмо недоступно другим воркерам
+OUTBOX_LEASE_SECONDS = 300
 # указываем директорию, в которую будут складываться файлы писем
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # Константа количества страниц
 QUANTITY = 10
+# Сколько номеров страниц показывать по обе стороны от текущей
+POSTS_PAGE_WINDOW = 2
+# Keyset-пагинация (?after=/?before=) вместо ?page= в лентах постов
+POSTS_CURSOR_PAGINATION = False
+# JSON API: размер страницы и опубликованная цель по задержке (p95)
+API_PAGE_SIZE = 20
+API_LATENCY_TARGET_MS = 50
+# Адреса, которым открыт /metrics в формате Prometheus
+METRICS_ALLOWED_IPS = ['127.0.0.1']
+# Загруженные картинки постов
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Миниатюры: свой бэкенд sorl знает адрес готовой миниатюры без kvstore
+THUMBNAIL_BACKEND = 'posts.thumbnails.PostThumbnailBackend'
+# Ширины миниатюр для srcset в лентах и на странице поста
+POST_THUMBNAIL_WIDTHS = (320, 640, 960)
+# Потоков фонового воркера (миниатюры, раскладка лент подписок)
+BACKGROUND_WORKERS = 2
+# Лента подписок: столько подписчиков раскладываем прямо в запросе,
+# остальных — пачками по FANOUT_BATCH_SIZE в фоновом воркере
+FANOUT_INLINE_LIMIT = 100
+FANOUT_BATCH_SIZE = 1000
+# Сколько последних постов автора попадает в ленту при подписке
+FOLLOW_BACKFILL_POSTS = 50
+# Допуск записей (core.admission): у каждого пользователя ведро на
+# WRITE_BUCKET_CAPACITY записей, пополняется со скоростью
+# WRITE_BUCKET_REFILL_PER_SECOND; процесс выполняет не больше
+# WRITE_MAX_IN_FLIGHT записей одновременно, остальным — 429
+WRITE_BUCKET_CAPACITY = 10
+WRITE_BUCKET_REFILL_PER_SECOND = 0.2
+WRITE_MAX_IN_FLIGHT = 4
+WRITE_BUSY_RETRY_AFTER = 1
+# Сколько групп отдаёт автодополнение в форме поста
+GROUP_AUTOCOMPLETE_LIMIT = 20